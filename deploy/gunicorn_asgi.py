@@ -0,0 +1,18 @@
+# ASGI profile: greenshan.async_views on uvicorn workers, with gunicorn
+# managing the processes.
+#
+#   pip install -r deploy/requirements-asgi.txt
+#   python manage.py migrate
+#   gunicorn -c deploy/gunicorn_asgi.py greenshan_project.asgi
+#
+# One event loop per core: slow clients cost a socket, not a thread.
+# Compare both profiles with `python manage.py bench_servers`.
+
+import multiprocessing
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn_worker.UvicornWorker"
+timeout = 30
+keepalive = 5
@@ -0,0 +1,16 @@
+# WSGI profile: sync views on gunicorn threaded workers.
+#
+#   gunicorn -c deploy/gunicorn_wsgi.py greenshan_project.wsgi
+#
+# Each worker serves at most `threads` requests at once; a slow client
+# holds one of them for as long as it takes to send or read.
+
+import multiprocessing
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+timeout = 30
+keepalive = 5
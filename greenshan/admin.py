@@ -1,12 +1,16 @@
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.html import format_html
 
+from . import search
+
 from .models import (
     Project,
     ProjectMedia,
     Testimonial,
     Service,
     ContactRequest,
+    Job,
 )
 
 # =================================================
@@ -43,6 +47,8 @@ class ProjectMediaInline(admin.TabularInline):
 # PROJECT ADMIN
 # =================================================
 
+ADMIN_SEARCH_LIMIT = 500
+
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):
     list_display = (
@@ -56,7 +62,9 @@ class ProjectAdmin(admin.ModelAdmin):
     )
     list_editable = ("featured",)
     list_filter = ("featured", "category", "created")
-    search_fields = ("title", "client", "category")
+    # Free text goes through the full-text index (search.py); only the
+    # category is matched here, exactly.
+    search_fields = ("=category",)
     date_hierarchy = "created"
     ordering = ("-created",)
 
@@ -65,6 +73,16 @@ class ProjectAdmin(admin.ModelAdmin):
 
     inlines = [ProjectMediaInline]
 
+    def get_search_results(self, request, queryset, search_term):
+        matches, may_have_duplicates = super().get_search_results(
+            request, queryset, search_term
+        )
+        if not search_term.strip():
+            return matches, may_have_duplicates
+
+        ids = search.search_ids(search_term, limit=ADMIN_SEARCH_LIMIT)
+        return matches | queryset.filter(pk__in=ids), may_have_duplicates
+
 
 # =================================================
 # PROJECT MEDIA ADMIN
@@ -81,6 +99,7 @@ class ProjectMediaAdmin(admin.ModelAdmin):
     list_filter = ("media_type", "created")
     list_editable = ("order",)
     search_fields = ("project__title",)
+    list_select_related = ("project",)
     ordering = ("project", "order")
     readonly_fields = ("created",)
 
@@ -121,3 +140,26 @@ class ContactRequestAdmin(admin.ModelAdmin):
     search_fields = ("name", "email", "subject")
     date_hierarchy = "created"
     ordering = ("-created",)
+
+
+# =================================================
+# BACKGROUND JOB ADMIN
+# =================================================
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("name", "status", "attempts", "run_after", "finished")
+    list_filter = ("status", "name")
+    ordering = ("-created",)
+    readonly_fields = ("created", "finished", "locked_by", "locked_at", "last_error")
+    actions = ["retry_jobs"]
+
+    @admin.action(description="Retry selected jobs")
+    def retry_jobs(self, request, queryset):
+        updated = queryset.exclude(status=Job.RUNNING).update(
+            status=Job.QUEUED,
+            attempts=0,
+            run_after=timezone.now(),
+            finished=None,
+        )
+        self.message_user(request, f"{updated} job(s) re-queued.")
@@ -9,6 +9,8 @@ class GreenshanConfig(AppConfig):
         from django.db.models.signals import post_migrate
         from django.contrib.auth import get_user_model
 
+        from . import signals  # noqa: F401
+
         def create_superuser(sender, **kwargs):
             User = get_user_model()
             if not User.objects.filter(username='admin').exists():
@@ -0,0 +1,147 @@
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.db.models import Prefetch
+from django.http import Http404
+from django.shortcuts import render, redirect
+from django.views import View
+
+from .caching import (
+    cache_public_page,
+    conditional_public_page,
+    resolve_user,
+    PROJECTS,
+    SERVICES,
+)
+from . import spool, throttling
+from .models import Project, ProjectMedia, Service, ContactRequest
+from .routers import replica_reads
+from .views import (
+    HOME_FEATURED_LIMIT,
+    contact_submission,
+    contact_throttled,
+    portfolio_context,
+    portfolio_paginator,
+    with_next_page,
+)
+
+# =========================================================
+# ASYNC PUBLIC VIEWS
+# =========================================================
+# The public pages of greenshan.views for ASGI (ASYNC_VIEWS, set by
+# greenshan_project/asgi.py). Same templates, caching and replica
+# routing; queries go through the async ORM and everything a template
+# touches is loaded before render(), which runs on the event loop.
+
+
+@replica_reads
+@conditional_public_page(PROJECTS)
+@cache_public_page(PROJECTS)
+async def home(request):
+    featured_projects = [
+        project async for project in Project.objects.filter(featured=True)[:HOME_FEATURED_LIMIT]
+    ]
+
+    return render(request, "index.html", {
+        "featured_projects": featured_projects
+    })
+
+
+@cache_public_page()
+async def about(request):
+    return render(request, "greenshan/about.html")
+
+
+@replica_reads
+@cache_public_page(SERVICES)
+async def services_view(request):
+    services = [service async for service in Service.objects.order_by("order")]
+    return render(
+        request,
+        "greenshan/services.html",
+        {"services": services},
+    )
+
+
+async def _portfolio_page(request):
+    paginator, category = portfolio_paginator(request)
+    page = await paginator.apage(request.GET.get("cursor"))
+    return portfolio_context(request, page, category)
+
+
+@replica_reads
+@conditional_public_page(PROJECTS)
+@cache_public_page(PROJECTS)
+async def portfolio(request):
+    return render(
+        request,
+        "greenshan/portfolio.html",
+        await _portfolio_page(request),
+    )
+
+
+@replica_reads
+@conditional_public_page(PROJECTS)
+@cache_public_page(PROJECTS)
+async def portfolio_more(request):
+    context = await _portfolio_page(request)
+    return with_next_page(
+        render(request, "greenshan/partials/project_cards.html", context),
+        context,
+    )
+
+
+@replica_reads
+@conditional_public_page(PROJECTS)
+@cache_public_page(PROJECTS)
+async def project_detail(request, slug):
+    queryset = Project.objects.prefetch_related(
+        Prefetch(
+            "media",
+            queryset=ProjectMedia.objects.order_by("order", "created"),
+        )
+    )
+    try:
+        project = await queryset.aget(slug=slug)
+    except Project.DoesNotExist:
+        raise Http404("No project found matching the query")
+
+    return render(request, "greenshan/detail.html", {
+        "project": project,
+        "object": project,
+    })
+
+
+# =========================================================
+# CONTACT (ASYNC)
+# =========================================================
+
+class ContactView(View):
+    template_name = "greenshan/contact.html"
+
+    async def get(self, request):
+        await resolve_user(request)
+        return render(request, self.template_name)
+
+    async def post(self, request):
+        await resolve_user(request)
+        fields, error = contact_submission(request)
+        if error:
+            messages.error(request, error)
+            return redirect("greenshan:contact")
+
+        verdict, retry_after = await sync_to_async(throttling.check_contact)(request, fields)
+        if retry_after:
+            return contact_throttled(request, self.template_name, retry_after)
+
+        if verdict == throttling.ACCEPTED:
+            if spool.enabled():
+                await sync_to_async(spool.append)(fields)
+            else:
+                await ContactRequest.objects.acreate(**fields)
+            await sync_to_async(throttling.remember_contact)(fields)
+
+        messages.success(request, "Message sent successfully.")
+        return redirect("greenshan:contact")
+
+
+contact = ContactView.as_view()
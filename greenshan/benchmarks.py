@@ -0,0 +1,312 @@
+import json
+import statistics
+import time
+import tracemalloc
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import search, stats, uploads
+from . import urls as greenshan_urls
+from .models import (
+    ContactRequest,
+    Project,
+    ProjectMedia,
+    Service,
+    Testimonial,
+)
+
+# =================================================
+# VIEW BENCHMARKS
+# =================================================
+# `manage.py bench_views` seeds a throwaway test database at each scale,
+# requests every URL in greenshan/urls.py through the test client and
+# compares query counts, latency and peak memory with a stored baseline.
+# Writes (POSTs) run in a transaction that is rolled back, so every
+# iteration sees the same dataset.
+
+SCALES = (10, 1000, 50000)
+
+MEDIA_PER_PROJECT = 3
+SEED_BATCH_SIZE = 1000
+
+MEDIA_KINDS = (
+    (ProjectMedia.MEDIA_IMAGE, "jpg"),
+    (ProjectMedia.MEDIA_VIDEO, "mp4"),
+    (ProjectMedia.MEDIA_DOCUMENT, "pdf"),
+)
+
+
+# ---------------------------------------------
+# Synthetic data
+# ---------------------------------------------
+
+def seed(projects):
+    """
+    ``projects`` projects with media, plus a proportional number of
+    testimonials and contact messages. Bypasses signals (bulk_create),
+    then rebuilds the search index and dashboard counters in one go.
+    Returns the fixtures the cases link to.
+    """
+    today = timezone.localdate()
+    categories = [value for value, _ in Project.CATEGORY_CHOICES]
+
+    Service.objects.bulk_create(
+        Service(title=f"Service {i}", summary="Editing, grading and sound.", order=i)
+        for i in range(6)
+    )
+
+    rows = Project.objects.bulk_create(
+        (
+            Project(
+                title=f"Project {i}",
+                slug=f"project-{i}",
+                client=f"Client {i % 50}",
+                location=f"City {i % 20}",
+                category=categories[i % len(categories)],
+                project_date=today - timedelta(days=i % 3650),
+                description=f"Cinematic edit number {i}: colour grading, motion graphics and sound design.",
+                featured=i % 20 == 0,
+            )
+            for i in range(projects)
+        ),
+        batch_size=SEED_BATCH_SIZE,
+    )
+
+    ProjectMedia.objects.bulk_create(
+        (
+            ProjectMedia(
+                project=project,
+                file=f"projects/{project.slug}/media/file-{j}.{extension}",
+                media_type=kind,
+                caption=f"Item {j}",
+                order=j,
+            )
+            for project in rows
+            for j, (kind, extension) in enumerate(MEDIA_KINDS[:MEDIA_PER_PROJECT])
+        ),
+        batch_size=SEED_BATCH_SIZE,
+    )
+
+    Testimonial.objects.bulk_create(
+        (
+            Testimonial(author=f"Client {i}", text="Great work, on time.", visible=i % 3 != 0)
+            for i in range(max(5, projects // 10))
+        ),
+        batch_size=SEED_BATCH_SIZE,
+    )
+
+    ContactRequest.objects.bulk_create(
+        (
+            ContactRequest(
+                name=f"Visitor {i}",
+                email=f"visitor{i}@example.com",
+                subject=f"Enquiry {i}",
+                message="We'd like a quote for a promotional video.",
+                handled=i % 2 == 0,
+            )
+            for i in range(projects)
+        ),
+        batch_size=SEED_BATCH_SIZE,
+    )
+
+    search.rebuild()
+    stats.reconcile()
+
+    staff = User.objects.create_user("bench-staff", password="bench", is_staff=True)
+    project = rows[len(rows) // 2]
+    return {
+        "staff": staff,
+        "project": project,
+        "testimonial": Testimonial.objects.first(),
+        "message": ContactRequest.objects.order_by("pk")[len(rows) // 2],
+        "upload": uploads.start(project, "clip.mp4", ProjectMedia.MEDIA_VIDEO, 1024, user=staff),
+    }
+
+
+# ---------------------------------------------
+# Cases
+# ---------------------------------------------
+
+class Case:
+    """
+    One request to time. ``args`` maps the fixtures to URL arguments.
+    """
+
+    def __init__(self, name, url_name, args=None, query="", method="get", data=None, staff=False):
+        self.name = name
+        self.url_name = url_name
+        self.args = args
+        self.query = query
+        self.method = method
+        self.data = data or {}
+        self.staff = staff
+
+    def url(self, fixtures):
+        args = self.args(fixtures) if self.args else []
+        url = reverse(f"greenshan:{self.url_name}", args=args)
+        return f"{url}?{self.query}" if self.query else url
+
+    def request(self, client, url):
+        if self.method == "get":
+            return client.get(url)
+        with transaction.atomic():
+            response = getattr(client, self.method)(url, self.data)
+            transaction.set_rollback(True)
+        return response
+
+
+def _project(fixtures):
+    return [fixtures["project"].pk]
+
+
+def _message(fixtures):
+    return [fixtures["message"].pk]
+
+
+def _testimonial(fixtures):
+    return [fixtures["testimonial"].pk]
+
+
+CASES = [
+    # Public
+    Case("home", "home"),
+    Case("about", "about"),
+    Case("services", "services"),
+    Case("portfolio", "portfolio"),
+    Case("portfolio_category", "portfolio", query="category=motion"),
+    Case("portfolio_more", "portfolio_more"),
+    Case("search", "search", query="q=cinematic+edit"),
+    Case("contact", "contact"),
+    Case("contact_post", "contact", method="post", data={
+        "name": "Visitor", "email": "visitor@example.com", "message": "Benchmark enquiry",
+    }),
+    Case("project_detail", "project_detail", args=lambda fixtures: [fixtures["project"].slug]),
+
+    # Staff
+    Case("dashboard", "dashboard", staff=True),
+    Case("manage_list", "manage_list", staff=True),
+    Case("manage_create", "manage_create", staff=True),
+    Case("manage_edit", "manage_edit", args=_project, staff=True),
+    Case("manage_delete", "manage_delete", args=_project, method="post", staff=True),
+    Case("upload_start", "upload_start", args=_project, method="post", staff=True, data={
+        "filename": "clip.mp4", "media_type": ProjectMedia.MEDIA_VIDEO, "size": 1024,
+    }),
+    Case("upload_chunk", "upload_chunk", args=lambda fixtures: [fixtures["upload"].pk], staff=True),
+    Case("manage_testimonials", "manage_testimonials", staff=True),
+    Case("testimonial_toggle", "testimonial_toggle", args=_testimonial, method="post", staff=True),
+    Case("testimonial_delete", "testimonial_delete", args=_testimonial, method="post", staff=True),
+    Case("manage_messages", "manage_messages", staff=True),
+    Case("manage_messages_pending", "manage_messages", query="status=pending", staff=True),
+    Case("messages_bulk", "messages_bulk", method="post", staff=True, data={
+        "action": "handled", "scope": "all", "status": "pending",
+    }),
+    Case("message_detail", "message_detail", args=_message, staff=True),
+    Case("message_handled", "message_handled", args=_message, method="post", staff=True),
+    Case("message_delete", "message_delete", args=_message, method="post", staff=True),
+    Case("contact_throttle_stats", "contact_throttle_stats", staff=True),
+]
+
+
+def uncovered_urls():
+    """
+    Names in greenshan/urls.py without a case; should stay empty.
+    """
+    covered = {case.url_name for case in CASES}
+    return sorted(
+        pattern.name for pattern in greenshan_urls.urlpatterns
+        if pattern.name not in covered
+    )
+
+
+# ---------------------------------------------
+# Measuring
+# ---------------------------------------------
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[round(fraction * (len(ordered) - 1))]
+
+
+def measure(client, case, fixtures, iterations=20, warmup=2):
+    """
+    Status, queries per request, wall time percentiles (ms) and peak
+    Python memory (KiB) of one case. Memory is traced in a separate
+    request so tracemalloc's overhead stays out of the timings.
+    """
+    url = case.url(fixtures)
+    for _ in range(warmup):
+        case.request(client, url)
+
+    timings = []
+    for _ in range(max(1, iterations)):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = case.request(client, url)
+            timings.append((time.perf_counter() - start) * 1000)
+        # Read now: the next request resets the connection's query log.
+        query_count = len(queries)
+
+    tracemalloc.start()
+    try:
+        case.request(client, url)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "status": response.status_code,
+        "queries": query_count,
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(percentile(timings, 0.95), 3),
+        "max_ms": round(max(timings), 3),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+# ---------------------------------------------
+# Baselines
+# ---------------------------------------------
+
+def load_baseline(path):
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh).get("results", {})
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path, results, meta):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump({"meta": meta, "results": results}, fh, indent=2, sort_keys=True)
+        fh.write("\n")
+
+
+def compare(results, baseline, threshold=0.5, min_ms=5.0, min_kib=64):
+    """
+    Regressions of ``results`` against ``baseline`` ({scale: {case:
+    metrics}}), as readable strings. Any extra query is a regression;
+    median time and peak memory only when they grow by more than
+    ``threshold`` (a fraction) and by more than the absolute floor, so
+    sub-millisecond jitter never fails a run.
+    """
+    regressions = []
+    for scale, cases in results.items():
+        for name, current in cases.items():
+            before = baseline.get(str(scale), {}).get(name)
+            if not before:
+                continue
+            if current["queries"] > before["queries"]:
+                regressions.append(
+                    f"{scale} {name}: queries {before['queries']} -> {current['queries']}"
+                )
+            for metric, floor in (("p50_ms", min_ms), ("peak_kib", min_kib)):
+                old, new = before[metric], current[metric]
+                if new > old * (1 + threshold) and new - old > floor:
+                    regressions.append(f"{scale} {name}: {metric} {old} -> {new}")
+    return regressions
@@ -0,0 +1,293 @@
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.views.decorators.http import condition
+
+from .routers import is_sticky
+
+# =================================================
+# CONTENT GROUPS
+# =================================================
+# Every public page declares which groups of content it renders. Saving
+# or deleting a model bumps only its group's version, which changes the
+# cache key of exactly the pages that depend on it.
+
+PROJECTS = "projects"
+SERVICES = "services"
+TESTIMONIALS = "testimonials"
+
+
+def _cache():
+    return caches[getattr(settings, "PAGE_CACHE_ALIAS", "default")]
+
+
+def _version_key(group):
+    return f"greenshan:version:{group}"
+
+
+def content_versions(groups):
+    """
+    Current version of each group, fetched in one cache round trip.
+    Missing versions are seeded from the clock so an evicted counter
+    can never roll back to a value that old pages were cached under.
+    """
+    cache = _cache()
+    keys = [_version_key(group) for group in groups]
+    found = cache.get_many(keys)
+
+    for key in keys:
+        if key not in found:
+            cache.add(key, time.time_ns(), None)
+            found[key] = cache.get(key)
+
+    return [found[key] for key in keys]
+
+
+async def acontent_versions(groups):
+    cache = _cache()
+    keys = [_version_key(group) for group in groups]
+    found = await cache.aget_many(keys)
+
+    for key in keys:
+        if key not in found:
+            await cache.aadd(key, time.time_ns(), None)
+            found[key] = await cache.aget(key)
+
+    return [found[key] for key in keys]
+
+
+def invalidate(*groups):
+    cache = _cache()
+    for group in groups:
+        try:
+            cache.incr(_version_key(group))
+        except ValueError:
+            cache.set(_version_key(group), time.time_ns(), None)
+
+
+# =================================================
+# FULL-PAGE CACHE
+# =================================================
+
+def is_cacheable_request(request):
+    """
+    Only anonymous GET/HEAD without pending flash messages: base.html
+    renders per-user navigation and message toasts. A browser that just
+    wrote renders from the primary rather than a copy a replica produced.
+    """
+    return (
+        request.method in ("GET", "HEAD")
+        and not request.user.is_authenticated
+        and "messages" not in request.COOKIES
+        and not is_sticky(request)
+    )
+
+
+async def resolve_user(request):
+    """
+    Load the session and user without blocking the event loop. Async
+    views call this first; afterwards request.user (templates,
+    is_cacheable_request) is a plain object that never queries.
+    """
+    request.user = await request.auser()
+    return request.user
+
+
+async def ais_cacheable_request(request):
+    await resolve_user(request)
+    return is_cacheable_request(request)
+
+
+def page_key(request, versions):
+    path = hashlib.md5(
+        f"{request.get_host()}{request.get_full_path()}".encode()
+    ).hexdigest()
+    release = getattr(settings, "PAGE_CACHE_RELEASE", "")
+    stamp = ".".join(str(version) for version in versions)
+    return f"greenshan:page:{release}:{stamp}:{path}"
+
+
+def page_cache_enabled():
+    return getattr(settings, "PAGE_CACHE_ENABLED", True)
+
+
+def cached_response(cached):
+    content, headers = cached
+    response = HttpResponse(content, headers=headers)
+    response["X-Cache"] = "HIT"
+    return response
+
+
+def cache_entry(response):
+    """
+    (content, headers) to store, or None if the response must not be cached.
+    """
+    if hasattr(response, "render") and not response.is_rendered:
+        response.render()
+
+    if response.status_code == 200 and not response.streaming and not response.cookies:
+        return (response.content, dict(response.items()))
+    return None
+
+
+def cache_public_page(*groups):
+    """
+    Serve anonymous hits for a public view straight from the cache.
+    Entries are keyed on the versions of ``groups``; signals bump those
+    versions, so no explicit purge is ever needed.
+    """
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                # Resolve the user even with the cache off: templates read it.
+                if not await ais_cacheable_request(request) or not page_cache_enabled():
+                    return await view_func(request, *args, **kwargs)
+
+                cache = _cache()
+                key = page_key(request, await acontent_versions(groups))
+                cached = await cache.aget(key)
+                if cached is not None:
+                    return cached_response(cached)
+
+                response = await view_func(request, *args, **kwargs)
+                entry = cache_entry(response)
+                if entry is not None:
+                    await cache.aset(key, entry, getattr(settings, "PAGE_CACHE_TIMEOUT", 600))
+                    response["X-Cache"] = "MISS"
+                return response
+
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not page_cache_enabled() or not is_cacheable_request(request):
+                return view_func(request, *args, **kwargs)
+
+            cache = _cache()
+            key = page_key(request, content_versions(groups))
+            cached = cache.get(key)
+            if cached is not None:
+                return cached_response(cached)
+
+            response = view_func(request, *args, **kwargs)
+            entry = cache_entry(response)
+            if entry is not None:
+                cache.set(key, entry, getattr(settings, "PAGE_CACHE_TIMEOUT", 600))
+                response["X-Cache"] = "MISS"
+            return response
+
+        return wrapper
+    return decorator
+
+
+# =================================================
+# CONDITIONAL GET (ETag)
+# =================================================
+
+def page_etag(versions):
+    release = getattr(settings, "PAGE_CACHE_RELEASE", "")
+    stamp = ".".join(str(version) for version in versions)
+    return hashlib.md5(f"{release}:{stamp}".encode()).hexdigest()
+
+
+def conditional_public_page(*groups):
+    """
+    Answer repeat anonymous visits with 304 before the view runs.
+
+    The ETag is built from the versions of ``groups`` (the ones
+    cache_public_page keys on) and the release: one cache read, no
+    query, so a page-cache hit stays query-free. Signals bump the
+    versions on every save and delete, so no Last-Modified is sent (the
+    newest ``updated`` does not move when a row is deleted), and a
+    deploy with new templates invalidates old copies.
+    """
+    def decorator(view_func):
+        def etag_func(request, *args, **kwargs):
+            return request._page_etag
+
+        conditional_view = condition(etag_func=etag_func)(view_func)
+
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                if not await ais_cacheable_request(request):
+                    return await view_func(request, *args, **kwargs)
+                # condition() calls etag_func synchronously: read the
+                # versions first so it only returns the result.
+                request._page_etag = page_etag(await acontent_versions(groups))
+                return await conditional_view(request, *args, **kwargs)
+
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            # Logged-in pages carry per-user navigation: never 304 them.
+            if not is_cacheable_request(request):
+                return view_func(request, *args, **kwargs)
+            request._page_etag = page_etag(content_versions(groups))
+            return conditional_view(request, *args, **kwargs)
+
+        return wrapper
+    return decorator
+
+
+# =================================================
+# FRAGMENT CACHE
+# =================================================
+# Rendered markup per object (project cards), keyed on the object's pk
+# and ``updated`` stamp. A saved project gets a new key, so entries are
+# never invalidated and a per-process cache is as correct as a shared
+# one. Unlike the page cache this also serves logged-in staff and pages
+# just re-rendered after an unrelated change bumped PROJECTS.
+
+def _fragment_cache():
+    return caches[getattr(settings, "FRAGMENT_CACHE_ALIAS", "default")]
+
+
+def fragment_cache_enabled():
+    return getattr(settings, "FRAGMENT_CACHE_ENABLED", True)
+
+
+def fragment_key(template_name, obj):
+    release = getattr(settings, "PAGE_CACHE_RELEASE", "")
+    stamp = int(obj.updated.timestamp() * 1_000_000) if obj.updated else 0
+    return f"greenshan:fragment:{release}:{template_name}:{obj._meta.label_lower}:{obj.pk}:{stamp}"
+
+
+def render_fragments(template_name, objects, render):
+    """
+    Joined markup for ``objects``. A list seen before (same rows, same
+    stamps, same order) is one cache hit; otherwise one get_many for its
+    cards and ``render(obj)`` only for the cards that missed.
+    """
+    objects = list(objects)
+    if not fragment_cache_enabled():
+        return "".join(render(obj) for obj in objects)
+
+    cache = _fragment_cache()
+    timeout = getattr(settings, "FRAGMENT_CACHE_TIMEOUT", 60 * 60 * 24)
+    keys = [fragment_key(template_name, obj) for obj in objects]
+    list_key = f"greenshan:fragments:{hashlib.md5(' '.join(keys).encode()).hexdigest()}"
+
+    markup = cache.get(list_key)
+    if markup is not None:
+        return markup
+
+    found = cache.get_many(keys)
+    missing = {}
+    for key, obj in zip(keys, objects):
+        if key not in found:
+            found[key] = missing[key] = render(obj)
+    if missing:
+        cache.set_many(missing, timeout)
+
+    markup = "".join(found[key] for key in keys)
+    cache.set(list_key, markup, timeout)
+    return markup
@@ -1,9 +1,15 @@
 from django import forms
 from django.forms import inlineformset_factory
 from django.core.exceptions import ValidationError
-from PIL import Image
 
-from .models import Project, ProjectMedia, Testimonial
+from .models import (
+    Project,
+    ProjectMedia,
+    Testimonial,
+    MAX_MEDIA_PER_PROJECT,
+    validate_file_content,
+    validate_file_extension,
+)
 
 
 # =================================================
@@ -33,7 +39,11 @@ class ProjectForm(forms.ModelForm):
             "project_date": forms.DateInput(attrs={"type": "date"}),
             "description": forms.Textarea(attrs={"rows": 6}),
             "experience_notes": forms.Textarea(attrs={"rows": 4}),
+            "cover": forms.ClearableFileInput(attrs={"accept": "image/*"}),
         }
+        # forms.ImageField would read and verify() the whole upload with
+        # Pillow; clean_cover sniffs the header instead.
+        field_classes = {"cover": forms.FileField}
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -44,18 +54,16 @@ class ProjectForm(forms.ModelForm):
 
     def clean_cover(self):
         """
-        Extra safety check to ensure uploaded cover is a valid image.
+        Extra safety check to ensure uploaded cover is a valid image,
+        from its header bytes alone.
         """
         cover = self.cleaned_data.get("cover")
-        if not cover:
+        if not cover or not hasattr(cover, "content_type"):
+            # Empty, or the already-stored file left unchanged.
             return cover
 
-        try:
-            img = Image.open(cover)
-            img.verify()
-        except Exception:
-            raise ValidationError("Upload a valid image file.")
-
+        validate_file_extension(cover, "image")
+        validate_file_content(cover, "image")
         return cover
 
 
@@ -102,7 +110,7 @@ class BaseProjectMediaFormSet(forms.BaseInlineFormSet):
             if form.cleaned_data and not form.cleaned_data.get("DELETE", False)
         ]
 
-        if len(active_forms) > 10:
+        if len(active_forms) > MAX_MEDIA_PER_PROJECT:
             raise ValidationError(
                 "A project can have a maximum of 10 media files."
             )
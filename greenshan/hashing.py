@@ -0,0 +1,64 @@
+import hashlib
+
+# =================================================
+# BLOCK-CHAINED SHA-256
+# =================================================
+# Content digest = SHA-256 over the SHA-256 of each fixed-size block.
+# Unlike one running hashlib object, its state (the finished block
+# digests) is plain data, so an upload can be hashed chunk by chunk
+# across requests and worker processes and still yield the digest a
+# single streaming pass over the same bytes would.
+
+HASH_BLOCK_SIZE = 4 * 1024 * 1024  # 4 MB
+
+
+class BlockHasher:
+
+    def __init__(self, digests=()):
+        self.digests = list(digests)
+        self._block = hashlib.sha256()
+        self._filled = 0
+
+    @property
+    def state(self):
+        """
+        Resumable state; only valid on a block boundary.
+        """
+        if self._filled:
+            raise ValueError("Hasher state is only resumable on a block boundary.")
+        return list(self.digests)
+
+    def update(self, data):
+        view = memoryview(data)
+        while view:
+            take = min(len(view), HASH_BLOCK_SIZE - self._filled)
+            self._block.update(view[:take])
+            self._filled += take
+            view = view[take:]
+            if self._filled == HASH_BLOCK_SIZE:
+                self.digests.append(self._block.hexdigest())
+                self._block = hashlib.sha256()
+                self._filled = 0
+
+    def final_digests(self):
+        """
+        Block digests including the trailing partial block.
+        """
+        digests = list(self.digests)
+        if self._filled or not digests:
+            digests.append(self._block.hexdigest())
+        return digests
+
+    def hexdigest(self):
+        return combine(self.final_digests())
+
+
+def combine(digests):
+    return hashlib.sha256("".join(digests).encode()).hexdigest()
+
+
+def hash_stream(chunks):
+    hasher = BlockHasher()
+    for chunk in chunks:
+        hasher.update(chunk)
+    return hasher.hexdigest()
@@ -0,0 +1,205 @@
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.utils.html import format_html, format_html_join
+from PIL import Image, ImageOps, features
+
+# =================================================
+# DERIVATIVE SETTINGS
+# =================================================
+
+# Fixed widths generated for every uploaded image. Widths larger than
+# the original are skipped; the original itself is always offered.
+DERIVATIVE_WIDTHS = (480, 960, 1440, 1920)
+
+# Modern formats, best first. Formats Pillow cannot encode are skipped.
+DERIVATIVE_FORMATS = ("avif", "webp")
+
+ENCODE_OPTIONS = {
+    "avif": {"quality": 60},
+    "webp": {"quality": 80, "method": 4},
+    "jpeg": {"quality": 82, "optimize": True, "progressive": True},
+    "png": {"optimize": True},
+}
+
+FORMAT_EXTENSIONS = {
+    "avif": "avif",
+    "webp": "webp",
+    "jpeg": "jpg",
+    "png": "png",
+    "gif": "gif",
+}
+
+MIME_TYPES = {
+    "avif": "image/avif",
+    "webp": "image/webp",
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+    "gif": "image/gif",
+}
+
+DEFAULT_SIZES = "100vw"
+
+
+def available_formats():
+    return [fmt for fmt in DERIVATIVE_FORMATS if features.check(fmt)]
+
+
+def variant_name(name, width, fmt):
+    """
+    Derivatives live next to the original upload, so they follow
+    upload_to_project_cover / upload_to_project_media automatically:
+
+        projects/<slug>/cover/reel.jpg -> projects/<slug>/cover/reel.960w.webp
+    """
+    root, _ = os.path.splitext(name)
+    return f"{root}.{width}w.{FORMAT_EXTENSIONS[fmt]}"
+
+
+def _encode(img, fmt):
+    if fmt == "jpeg" and img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    buffer = BytesIO()
+    img.save(buffer, format=fmt.upper(), **ENCODE_OPTIONS.get(fmt, {}))
+    return ContentFile(buffer.getvalue())
+
+
+# =================================================
+# GENERATION
+# =================================================
+
+def generate_variants(fieldfile, widths=DERIVATIVE_WIDTHS):
+    """
+    Build every derivative for an uploaded image and return the variant
+    manifest stored on the model. Runs once per upload, never per request.
+    """
+    storage = fieldfile.storage
+    name = fieldfile.name
+
+    with storage.open(name, "rb") as fh:
+        img = Image.open(fh)
+        source_format = (img.format or "").lower()
+        animated = getattr(img, "is_animated", False)
+        img = ImageOps.exif_transpose(img)
+        img.load()
+
+    width, height = img.size
+    manifest = {
+        "source": name,
+        "width": width,
+        "height": height,
+        "format": source_format,
+        "variants": {},
+    }
+
+    # Re-encoding an animated GIF would drop every frame but the first.
+    if animated or source_format not in FORMAT_EXTENSIONS:
+        return manifest
+
+    if img.mode == "P":
+        img = img.convert("RGBA")
+
+    formats = available_formats()
+    if source_format not in formats:
+        formats.append(source_format)
+
+    for target in widths:
+        if target >= width:
+            break
+        resized = img.resize(
+            (target, round(height * target / width)),
+            Image.Resampling.LANCZOS,
+        )
+        for fmt in formats:
+            path = variant_name(name, target, fmt)
+            if storage.exists(path):
+                storage.delete(path)
+            saved = storage.save(path, _encode(resized, fmt))
+            manifest["variants"].setdefault(fmt, {})[str(target)] = saved
+
+    return manifest
+
+
+def variant_paths(manifest):
+    return {
+        path
+        for paths in (manifest or {}).get("variants", {}).values()
+        for path in paths.values()
+    }
+
+
+# =================================================
+# TEMPLATE HELPERS
+# =================================================
+
+class ResponsiveImage:
+    """
+    Read-only view over a stored variant manifest. Building srcset
+    strings only touches the manifest, never the storage backend.
+    """
+
+    def __init__(self, fieldfile, manifest):
+        self.file = fieldfile
+        self.manifest = manifest if manifest and manifest.get("source") == fieldfile.name else {}
+
+    def __bool__(self):
+        return bool(self.file)
+
+    @property
+    def url(self):
+        return self.file.url
+
+    @property
+    def width(self):
+        return self.manifest.get("width")
+
+    @property
+    def height(self):
+        return self.manifest.get("height")
+
+    def srcset(self, fmt):
+        storage = self.file.storage
+        paths = self.manifest.get("variants", {}).get(fmt, {})
+        candidates = [
+            (storage.url(path), int(width))
+            for width, path in sorted(paths.items(), key=lambda item: int(item[0]))
+        ]
+        if fmt == self.manifest.get("format") and self.width:
+            candidates.append((self.url, self.width))
+        return ", ".join(f"{url} {width}w" for url, width in candidates)
+
+    def sources(self):
+        """
+        (mime type, srcset) pairs for <source> elements, best format first.
+        """
+        original = self.manifest.get("format")
+        return [
+            (MIME_TYPES[fmt], self.srcset(fmt))
+            for fmt in DERIVATIVE_FORMATS
+            if fmt != original and self.manifest.get("variants", {}).get(fmt)
+        ]
+
+    def render(self, sizes=DEFAULT_SIZES, **attrs):
+        """
+        <picture> markup with AVIF/WebP sources and an original-format
+        fallback. ``display: contents`` keeps existing img CSS intact.
+        """
+        img_attrs = {"src": self.url}
+        srcset = self.srcset(self.manifest.get("format"))
+        if srcset:
+            img_attrs["srcset"] = srcset
+            img_attrs["sizes"] = sizes
+        img_attrs.update(
+            (key.replace("_", "-"), value) for key, value in attrs.items()
+        )
+
+        return format_html(
+            '<picture style="display: contents;">{}<img {}></picture>',
+            format_html_join(
+                "",
+                '<source type="{}" srcset="{}" sizes="{}">',
+                ((mime, srcset, sizes) for mime, srcset in self.sources()),
+            ),
+            format_html_join(" ", '{}="{}"', img_attrs.items()),
+        )
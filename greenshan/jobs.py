@@ -0,0 +1,176 @@
+import logging
+import os
+import socket
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# =================================================
+# TASK REGISTRY
+# =================================================
+
+registry = {}
+
+
+def task(name):
+    """
+    Register a function as a background task under a stable name.
+    The name (not the import path) is what gets stored on the Job row.
+    """
+    def decorator(func):
+        registry[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name, max_attempts=None, delay=None, **payload):
+    """
+    Queue ``name`` once the current transaction commits, so workers
+    never see rows that could still roll back. Payload must be JSON.
+    A ``delay`` (seconds) holds the job back; delayed jobs are always
+    stored, even with JOBS_EAGER, and wait for `manage.py run_jobs`.
+    """
+    if name not in registry:
+        raise KeyError(f"Unknown job: {name}")
+
+    if getattr(settings, "JOBS_EAGER", False) and not delay:
+        transaction.on_commit(lambda: registry[name](**payload))
+        return
+
+    job = Job(name=name, payload=payload)
+    if max_attempts is not None:
+        job.max_attempts = max_attempts
+    if delay:
+        job.run_after = timezone.now() + timedelta(seconds=delay)
+    transaction.on_commit(job.save)
+
+
+# =================================================
+# CLAIMING & EXECUTION
+# =================================================
+
+def worker_name(index=0):
+    return f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+
+def backoff(attempts):
+    base = getattr(settings, "JOBS_RETRY_BACKOFF", 10)
+    return timedelta(seconds=base * 2 ** (attempts - 1))
+
+
+def claim_next(worker, batch=10):
+    """
+    Claim the oldest runnable job. The conditional UPDATE is the lock:
+    only one worker can flip a row from queued to running, on SQLite
+    and Postgres alike.
+    """
+    now = timezone.now()
+    candidates = list(
+        Job.objects.filter(status=Job.QUEUED, run_after__lte=now)
+        .values_list("pk", flat=True)[:batch]
+    )
+    for pk in candidates:
+        claimed = Job.objects.filter(pk=pk, status=Job.QUEUED).update(
+            status=Job.RUNNING,
+            locked_by=worker,
+            locked_at=now,
+            attempts=F("attempts") + 1,
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def execute(job):
+    func = registry.get(job.name)
+    try:
+        if func is None:
+            raise KeyError(f"Unknown job: {job.name}")
+        func(**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning("Job %s failed (attempt %s)", job, job.attempts)
+
+        if func is None or job.attempts >= job.max_attempts:
+            status, run_after = Job.DEAD, job.run_after
+        else:
+            status, run_after = Job.QUEUED, timezone.now() + backoff(job.attempts)
+
+        Job.objects.filter(pk=job.pk).update(
+            status=status,
+            run_after=run_after,
+            locked_by="",
+            locked_at=None,
+            last_error=error,
+            finished=timezone.now() if status == Job.DEAD else None,
+        )
+        return False
+
+    Job.objects.filter(pk=job.pk).update(
+        status=Job.DONE,
+        locked_by="",
+        locked_at=None,
+        last_error="",
+        finished=timezone.now(),
+    )
+    return True
+
+
+def run_pending(worker=None, limit=None):
+    """
+    Drain runnable jobs in the current process. Returns the number run.
+    """
+    worker = worker or worker_name()
+    count = 0
+    while limit is None or count < limit:
+        job = claim_next(worker)
+        if job is None:
+            break
+        execute(job)
+        count += 1
+    return count
+
+
+# =================================================
+# HOUSEKEEPING
+# =================================================
+
+def requeue_stale():
+    """
+    Recover jobs left running by a worker that died mid-job.
+    """
+    timeout = getattr(settings, "JOBS_LOCK_TIMEOUT", 600)
+    cutoff = timezone.now() - timedelta(seconds=timeout)
+    stale = Job.objects.filter(status=Job.RUNNING, locked_at__lt=cutoff)
+
+    dead = stale.filter(attempts__gte=F("max_attempts")).update(
+        status=Job.DEAD,
+        locked_by="",
+        locked_at=None,
+        last_error="Worker lock expired.",
+        finished=timezone.now(),
+    )
+    requeued = stale.update(status=Job.QUEUED, locked_by="", locked_at=None)
+    return requeued + dead
+
+
+def purge_finished(days):
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = Job.objects.filter(status=Job.DONE, finished__lt=cutoff).delete()
+    return deleted
+
+
+def worker_loop(index, poll_interval, should_stop):
+    worker = worker_name(index)
+    while not should_stop():
+        if not run_pending(worker, limit=1):
+            time.sleep(poll_interval)
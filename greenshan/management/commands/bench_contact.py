@@ -0,0 +1,141 @@
+import itertools
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from greenshan import spool
+from greenshan.models import ContactRequest
+
+BENCH_DOMAIN = 'bench.invalid'
+
+# Holds the contact table's write lock, like a long staff bulk action
+# or a burst of other writers.
+LOCK_SQL = {
+    'sqlite': ['BEGIN IMMEDIATE'],
+    'postgresql': ['BEGIN', 'LOCK TABLE greenshan_contactrequest IN EXCLUSIVE MODE'],
+}
+
+
+class Command(BaseCommand):
+    help = 'Contact form latency with direct inserts vs the write-behind spool, idle and under write load'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=8,
+            help='Concurrent visitors posting the form.',
+        )
+        parser.add_argument(
+            '--seconds',
+            type=float,
+            default=5.0,
+            help='Duration of each run.',
+        )
+        parser.add_argument(
+            '--hold-ms',
+            type=float,
+            default=200,
+            help='How long each competing write transaction holds the lock.',
+        )
+        parser.add_argument(
+            '--gap-ms',
+            type=float,
+            default=50,
+            help='Pause between competing write transactions.',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor not in LOCK_SQL:
+            raise CommandError(f'Unsupported database vendor: {connection.vendor}')
+
+        self.counter = itertools.count()
+        spool_dir = tempfile.mkdtemp(prefix='greenshan-spool-')
+        self.stdout.write(f'{connection.vendor} — {options["threads"]} thread(s), {options["seconds"]}s per run\n')
+        self.stdout.write(f"{'mode':>8}  {'db load':>7}  {'posts':>6}  {'p50 ms':>8}  {'p99 ms':>8}  {'max ms':>8}")
+
+        try:
+            with override_settings(CONTACT_THROTTLE_ENABLED=False, CONTACT_SPOOL_DIR=spool_dir):
+                for mode, write_behind in (('direct', False), ('spool', True)):
+                    for loaded in (False, True):
+                        with override_settings(CONTACT_WRITE_BEHIND=write_behind):
+                            latencies = self.run(options, loaded)
+                        self.report(mode, loaded, latencies)
+                    spool.flush()
+        finally:
+            ContactRequest.objects.filter(email__endswith=f'@{BENCH_DOMAIN}').delete()
+            shutil.rmtree(spool_dir, ignore_errors=True)
+
+    def run(self, options, loaded):
+        latencies = []
+        errors = []
+        done = threading.Event()
+        deadline = time.perf_counter() + options['seconds']
+
+        def visitor():
+            client = Client()
+            local = []
+            try:
+                while time.perf_counter() < deadline:
+                    n = next(self.counter)
+                    start = time.perf_counter()
+                    response = client.post(reverse('greenshan:contact'), {
+                        'name': f'Bench {n}',
+                        'email': f'visitor{n}@{BENCH_DOMAIN}',
+                        'message': f'Benchmark message {n}',
+                    })
+                    local.append(time.perf_counter() - start)
+                    if response.status_code != 302:
+                        raise CommandError(f'Contact form returned {response.status_code}')
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connections.close_all()
+                latencies.extend(local)
+
+        def competing_writer():
+            try:
+                with connection.cursor() as cursor:
+                    while not done.is_set():
+                        for sql in LOCK_SQL[connection.vendor]:
+                            cursor.execute(sql)
+                        time.sleep(options['hold_ms'] / 1000)
+                        cursor.execute('COMMIT')
+                        time.sleep(options['gap_ms'] / 1000)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=visitor) for _ in range(options['threads'])]
+        if loaded:
+            threads.append(threading.Thread(target=competing_writer))
+        for thread in threads:
+            thread.start()
+        for thread in threads[:options['threads']]:
+            thread.join()
+        done.set()
+        for thread in threads:
+            thread.join()
+
+        if errors:
+            raise CommandError(errors[0])
+        return latencies
+
+    def report(self, mode, loaded, latencies):
+        load = 'yes' if loaded else 'no'
+        if not latencies:
+            self.stdout.write(f'{mode:>8}  {load:>7}  no posts completed')
+            return
+        ordered = sorted(latencies)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        self.stdout.write(
+            f'{mode:>8}  {load:>7}  {len(ordered):>6}  {statistics.median(ordered) * 1000:>8.2f}  '
+            f'{p99 * 1000:>8.2f}  {ordered[-1] * 1000:>8.2f}'
+        )
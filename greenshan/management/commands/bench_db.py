@@ -0,0 +1,122 @@
+import statistics
+import threading
+import time
+from importlib.util import find_spec
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from django.test.utils import override_settings
+
+MODES = {
+    # A new connection (TCP + auth handshake) for every request.
+    'fresh': {'CONN_MAX_AGE': 0},
+    # One connection per worker thread, reused across requests.
+    'persistent': {'CONN_MAX_AGE': 60, 'CONN_HEALTH_CHECKS': True},
+    # Requests borrow from Django's psycopg 3 pool.
+    'pool': {'CONN_MAX_AGE': 0, 'POOL': True},
+}
+
+
+class Command(BaseCommand):
+    help = 'Requests per second with fresh, persistent and pooled database connections'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default='/portfolio/',
+            help='URL to request (page cache is disabled for the run).',
+        )
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=4,
+            help='Concurrent clients, like gunicorn threads.',
+        )
+        parser.add_argument(
+            '--seconds',
+            type=float,
+            default=5.0,
+            help='Duration of each mode.',
+        )
+        parser.add_argument(
+            '--modes',
+            nargs='+',
+            choices=list(MODES),
+            default=list(MODES),
+        )
+
+    def handle(self, *args, **options):
+        base = dict(connections.settings['default'])
+        vendor = connections['default'].vendor
+        self.stdout.write(f'{vendor} — {options["threads"]} thread(s), {options["seconds"]}s per mode\n')
+        self.stdout.write(f"{'mode':>10}  {'requests':>8}  {'req/s':>8}  {'p50 ms':>7}  {'p95 ms':>7}")
+
+        try:
+            for mode in options['modes']:
+                if mode == 'pool' and (vendor != 'postgresql' or find_spec('psycopg_pool') is None):
+                    self.stdout.write(f'{mode:>10}  skipped (needs PostgreSQL + psycopg[pool])')
+                    continue
+                self.configure(base, MODES[mode])
+                latencies = self.run(options)
+                self.report(mode, latencies, options['seconds'])
+        finally:
+            self.configure(base, {})
+
+    def configure(self, base, overrides):
+        overrides = dict(overrides)
+        settings_dict = dict(base, OPTIONS=dict(base.get('OPTIONS', {})))
+        if overrides.pop('POOL', False):
+            settings_dict['OPTIONS']['pool'] = {'min_size': 2, 'max_size': 20}
+        settings_dict.update(overrides)
+
+        connection = connections['default']
+        connection.close()
+        if hasattr(connection, 'close_pool'):
+            connection.close_pool()
+        del connections['default']
+        # Threads build their connection wrappers from this dict.
+        connections.settings['default'] = settings_dict
+
+    def run(self, options):
+        latencies = []
+        errors = []
+        deadline = time.perf_counter() + options['seconds']
+
+        def client_loop():
+            client = Client()
+            local = []
+            try:
+                while time.perf_counter() < deadline:
+                    start = time.perf_counter()
+                    response = client.get(options['path'])
+                    local.append(time.perf_counter() - start)
+                    if response.status_code != 200:
+                        raise CommandError(f'{options["path"]} returned {response.status_code}')
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connections.close_all()
+                latencies.extend(local)
+
+        with override_settings(PAGE_CACHE_ENABLED=False):
+            threads = [threading.Thread(target=client_loop) for _ in range(options['threads'])]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        if errors:
+            raise CommandError(errors[0])
+        return latencies
+
+    def report(self, mode, latencies, seconds):
+        if not latencies:
+            self.stdout.write(f'{mode:>10}  no requests completed')
+            return
+        ordered = sorted(latencies)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        self.stdout.write(
+            f'{mode:>10}  {len(latencies):>8}  {len(latencies) / seconds:>8.1f}  '
+            f'{statistics.median(ordered) * 1000:>7.2f}  {p95 * 1000:>7.2f}'
+        )
@@ -0,0 +1,213 @@
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from importlib.util import find_spec
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+PROFILES = {
+    # Sync views on gunicorn gthread workers.
+    'wsgi': ('greenshan_project.wsgi', 'deploy/gunicorn_wsgi.py', ['gunicorn']),
+    # greenshan.async_views on uvicorn workers.
+    'asgi': ('greenshan_project.asgi', 'deploy/gunicorn_asgi.py', ['gunicorn', 'uvicorn_worker']),
+}
+
+STARTUP_TIMEOUT = 30
+REQUEST_TIMEOUT = 10
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def fetch(port, path, header_delay=0.0):
+    """
+    One HTTP/1.1 request; returns the status code. With ``header_delay``
+    the headers trickle in one line at a time, like a client on a bad
+    mobile link.
+    """
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        lines = [
+            f'GET {path} HTTP/1.1',
+            f'Host: 127.0.0.1:{port}',
+            'User-Agent: greenshan-bench',
+            'Accept: text/html',
+            'Connection: close',
+        ]
+        for line in lines:
+            writer.write(f'{line}\r\n'.encode())
+            await writer.drain()
+            if header_delay:
+                await asyncio.sleep(header_delay)
+        writer.write(b'\r\n')
+        await writer.drain()
+
+        status_line = await reader.readline()
+        await reader.read()
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+class Command(BaseCommand):
+    help = 'Compare the WSGI and ASGI deployment profiles under many slow clients'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default='/portfolio/',
+            help='URL to request (page cache is disabled on the servers).',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=2,
+            help='Worker processes per server.',
+        )
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=4,
+            help='Threads per WSGI worker.',
+        )
+        parser.add_argument(
+            '--clients',
+            type=int,
+            default=10,
+            help='Concurrent normal clients (measured).',
+        )
+        parser.add_argument(
+            '--slow-clients',
+            type=int,
+            default=100,
+            help='Concurrent clients trickling their request headers.',
+        )
+        parser.add_argument(
+            '--header-delay',
+            type=float,
+            default=0.5,
+            help='Seconds a slow client waits between header lines.',
+        )
+        parser.add_argument(
+            '--seconds',
+            type=float,
+            default=10.0,
+            help='Duration of each profile.',
+        )
+        parser.add_argument(
+            '--profiles',
+            nargs='+',
+            choices=list(PROFILES),
+            default=list(PROFILES),
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f'{options["path"]} — {options["workers"]} worker(s), {options["clients"]} client(s) '
+            f'+ {options["slow_clients"]} slow, {options["seconds"]}s per profile\n'
+        )
+        self.stdout.write(
+            f"{'profile':>8}  {'requests':>8}  {'req/s':>8}  {'p50 ms':>8}  {'p95 ms':>8}  "
+            f"{'errors':>6}  {'slow done':>9}"
+        )
+
+        for name in options['profiles']:
+            module, config, needs = PROFILES[name]
+            missing = [package for package in needs if find_spec(package) is None]
+            if missing:
+                self.stdout.write(f'{name:>8}  skipped (pip install {" ".join(missing)})')
+                continue
+
+            port = free_port()
+            server = self.start(module, config, port, options)
+            try:
+                fast, errors, slow = asyncio.run(self.load(port, options))
+            finally:
+                server.terminate()
+                server.wait(10)
+            self.report(name, fast, errors, slow, options['seconds'])
+
+    def start(self, module, config, port, options):
+        env = dict(
+            os.environ,
+            BIND=f'127.0.0.1:{port}',
+            WEB_CONCURRENCY=str(options['workers']),
+            GUNICORN_THREADS=str(options['threads']),
+            PAGE_CACHE_ENABLED='False',
+        )
+        log = tempfile.TemporaryFile()
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', config, module],
+            cwd=settings.BASE_DIR,
+            env=env,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                break
+            try:
+                if asyncio.run(fetch(port, options['path'])) == 200:
+                    return server
+            except OSError:
+                time.sleep(0.2)
+
+        server.kill()
+        log.seek(0)
+        raise CommandError(f'{module} did not start:\n{log.read().decode()[-2000:]}')
+
+    async def load(self, port, options):
+        deadline = time.monotonic() + options['seconds']
+        latencies, errors, slow_done = [], [], []
+
+        async def client():
+            while time.monotonic() < deadline:
+                start = time.monotonic()
+                try:
+                    status = await asyncio.wait_for(fetch(port, options['path']), REQUEST_TIMEOUT)
+                except (OSError, asyncio.TimeoutError) as exc:
+                    errors.append(exc)
+                    continue
+                if status != 200:
+                    errors.append(status)
+                    continue
+                latencies.append(time.monotonic() - start)
+
+        async def slow_client():
+            while time.monotonic() < deadline:
+                try:
+                    await fetch(port, options['path'], header_delay=options['header_delay'])
+                except OSError:
+                    await asyncio.sleep(options['header_delay'])
+                    continue
+                slow_done.append(True)
+
+        tasks = [asyncio.create_task(slow_client()) for _ in range(options['slow_clients'])]
+        # Let the slow clients occupy their connections first.
+        await asyncio.sleep(min(1.0, options['header_delay']))
+        tasks += [asyncio.create_task(client()) for _ in range(options['clients'])]
+        await asyncio.gather(*tasks)
+        return latencies, errors, len(slow_done)
+
+    def report(self, name, latencies, errors, slow, seconds):
+        if not latencies:
+            self.stdout.write(f'{name:>8}  no requests completed ({len(errors)} errors)')
+            return
+        ordered = sorted(latencies)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        self.stdout.write(
+            f'{name:>8}  {len(ordered):>8}  {len(ordered) / seconds:>8.1f}  '
+            f'{statistics.median(ordered) * 1000:>8.2f}  {p95 * 1000:>8.2f}  '
+            f'{len(errors):>6}  {slow:>9}'
+        )
@@ -0,0 +1,55 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from greenshan.models import Project, allocate_slugs
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark slug allocation cost as same-title duplicates grow (rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            default=[10, 100, 1000],
+            help='Number of existing duplicates to measure against.',
+        )
+        parser.add_argument(
+            '--samples',
+            type=int,
+            default=20,
+            help='Saves timed at each size.',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'duplicates':>10}  {'queries/save':>12}  {'ms/save':>8}")
+
+        for size in options['sizes']:
+            try:
+                with transaction.atomic():
+                    Project.objects.bulk_create(
+                        allocate_slugs([Project(title='Corporate Video') for _ in range(size)])
+                    )
+
+                    with CaptureQueriesContext(connection) as queries:
+                        start = time.perf_counter()
+                        for _ in range(options['samples']):
+                            Project(title='Corporate Video').save()
+                        elapsed = time.perf_counter() - start
+
+                    self.stdout.write(
+                        f"{size:>10}  "
+                        f"{len(queries) / options['samples']:>12.1f}  "
+                        f"{elapsed * 1000 / options['samples']:>8.2f}"
+                    )
+                    raise Rollback
+            except Rollback:
+                pass
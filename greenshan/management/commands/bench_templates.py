@@ -0,0 +1,109 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.template.backends.django import DjangoTemplates
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+from greenshan.models import Project
+
+BENCH_PREFIX = 'bench-render-'
+
+# Template loaders Django would use without the explicit cached loader
+# in settings.TEMPLATES (DEBUG on, before Django 4.1).
+PLAIN_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+CONFIGS = {
+    # Every render re-reads and re-parses base.html and the partials.
+    'uncached': {'loaders': PLAIN_LOADERS, 'fragments': False},
+    # Parsed once per process; every card still renders on every hit.
+    'loader': {'loaders': None, 'fragments': False},
+    # Cards come from the fragment cache (warmed by the first render).
+    'fragments': {'loaders': None, 'fragments': True},
+}
+
+
+class Command(BaseCommand):
+    help = 'Template render time per page with plain loaders, cached loaders and card fragment caching'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--projects',
+            type=int,
+            default=1000,
+            help='Projects rendered as cards on each page.',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Renders per page and configuration.',
+        )
+
+    def handle(self, *args, **options):
+        count = options['projects']
+        Project.objects.bulk_create(
+            Project(
+                title=f'Benchmark project {i}',
+                slug=f'{BENCH_PREFIX}{i}',
+                category=Project.CATEGORY_CHOICES[i % len(Project.CATEGORY_CHOICES)][0],
+                description='Colour grading, motion graphics and sound design. ' * 4,
+                featured=True,
+            )
+            for i in range(count)
+        )
+
+        try:
+            projects = list(Project.objects.filter(slug__startswith=BENCH_PREFIX))
+            pages = {
+                'home': ('index.html', {'featured_projects': projects}),
+                'search': ('greenshan/search.html', {'projects': projects, 'query': 'benchmark'}),
+                'cards': ('greenshan/partials/project_cards.html', {'projects': projects}),
+                'about': ('greenshan/about.html', {}),
+            }
+
+            self.stdout.write(f'{count} project(s), {options["repeat"]} render(s) per cell, median ms\n')
+            self.stdout.write(f"{'page':>8}" + ''.join(f'  {name:>10}' for name in CONFIGS))
+            results = {page: [] for page in pages}
+            for config in CONFIGS.values():
+                backend = self.backend(config['loaders'])
+                with override_settings(FRAGMENT_CACHE_ENABLED=config['fragments']):
+                    for page, (template_name, context) in pages.items():
+                        results[page].append(self.time(backend, template_name, context, options['repeat']))
+
+            for page, timings in results.items():
+                self.stdout.write(f'{page:>8}' + ''.join(f'  {ms:>10.2f}' for ms in timings))
+        finally:
+            Project.objects.filter(slug__startswith=BENCH_PREFIX).delete()
+
+    def backend(self, loaders):
+        """
+        A fresh template engine like settings.TEMPLATES, with a cold
+        loader cache, optionally with different loaders.
+        """
+        config = dict(settings.TEMPLATES[0])
+        config.pop('BACKEND')
+        options = dict(config.get('OPTIONS', {}))
+        if loaders is not None:
+            options['loaders'] = loaders
+        return DjangoTemplates(dict(config, NAME='bench', APP_DIRS=False, OPTIONS=options))
+
+    def time(self, backend, template_name, context, repeat):
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        template = backend.get_template(template_name)
+        # The first render warms the loader and fragment caches.
+        template.render(context, request)
+
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            backend.get_template(template_name).render(context, request)
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,155 @@
+import json
+import platform
+import tempfile
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from django.test.utils import (
+    override_settings,
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from greenshan import benchmarks
+
+BENCH_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'bench'},
+    'fragments': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'bench-fragments'},
+}
+
+
+class Command(BaseCommand):
+    help = 'Time every greenshan URL on seeded datasets and fail on regressions against a baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scales',
+            type=int,
+            nargs='+',
+            default=[10, 1000],
+            help=f'Projects to seed per run (the suite covers {", ".join(map(str, benchmarks.SCALES))}).',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=20,
+            help='Timed requests per case.',
+        )
+        parser.add_argument(
+            '--cases',
+            nargs='+',
+            help='Only run these cases.',
+        )
+        parser.add_argument(
+            '--baseline',
+            default=str(Path(settings.BASE_DIR) / 'benchmarks' / 'baseline.json'),
+            help='Baseline JSON to compare against (and write with --update-baseline).',
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=0.5,
+            help='Allowed slowdown / memory growth as a fraction of the baseline.',
+        )
+        parser.add_argument(
+            '--min-ms',
+            type=float,
+            default=5.0,
+            help='Ignore median slowdowns smaller than this, whatever the fraction.',
+        )
+        parser.add_argument(
+            '--update-baseline',
+            action='store_true',
+            help='Store these results as the new baseline instead of comparing.',
+        )
+        parser.add_argument(
+            '--output',
+            help='Also write the results to this JSON file.',
+        )
+
+    def handle(self, *args, **options):
+        missing = benchmarks.uncovered_urls()
+        if missing:
+            raise CommandError(f'No benchmark case for: {", ".join(missing)}')
+
+        cases = benchmarks.CASES
+        if options['cases']:
+            cases = [case for case in cases if case.name in options['cases']]
+
+        results = {}
+        setup_test_environment()
+        try:
+            with tempfile.TemporaryDirectory() as media_root, override_settings(
+                CACHES=BENCH_CACHES,
+                PAGE_CACHE_ENABLED=False,
+                CONTACT_THROTTLE_ENABLED=False,
+                CONTACT_WRITE_BEHIND=False,
+                NOTIFY_TRANSPORTS={},
+                MEDIA_ROOT=media_root,
+                CHUNKED_UPLOAD_DIR=Path(media_root) / '.uploads',
+            ):
+                for scale in options['scales']:
+                    results[str(scale)] = self.run_scale(scale, cases, options)
+        finally:
+            teardown_test_environment()
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as fh:
+                json.dump(results, fh, indent=2, sort_keys=True)
+
+        baseline_path = Path(options['baseline'])
+        if options['update_baseline']:
+            merged = benchmarks.load_baseline(baseline_path)
+            merged.update(results)
+            benchmarks.save_baseline(baseline_path, merged, {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connections['default'].vendor,
+                'machine': platform.machine(),
+            })
+            self.stdout.write(self.style.SUCCESS(f'Baseline written to {baseline_path}'))
+            return
+
+        regressions = benchmarks.compare(
+            results,
+            benchmarks.load_baseline(baseline_path),
+            threshold=options['threshold'],
+            min_ms=options['min_ms'],
+        )
+        if regressions:
+            raise CommandError('Performance regressions:\n  ' + '\n  '.join(regressions))
+        self.stdout.write(self.style.SUCCESS('No regressions.'))
+
+    def run_scale(self, scale, cases, options):
+        """
+        Fresh test database per scale, destroyed afterwards.
+        """
+        old_config = setup_databases(verbosity=0, interactive=False, aliases=set(connections))
+        try:
+            self.stdout.write(f'\nSeeding {scale} project(s)...')
+            fixtures = benchmarks.seed(scale)
+            clients = {False: Client(), True: Client()}
+            clients[True].force_login(fixtures['staff'])
+
+            self.stdout.write(
+                f"{'case':<26}  {'status':>6}  {'queries':>7}  {'p50 ms':>8}  {'p95 ms':>8}  {'peak KiB':>9}"
+            )
+            measured = {}
+            for case in cases:
+                metrics = benchmarks.measure(clients[case.staff], case, fixtures, options['iterations'])
+                if metrics['status'] >= 400:
+                    raise CommandError(f'{case.name} returned {metrics["status"]}')
+                measured[case.name] = metrics
+                self.stdout.write(
+                    f"{case.name:<26}  {metrics['status']:>6}  {metrics['queries']:>7}  "
+                    f"{metrics['p50_ms']:>8.2f}  {metrics['p95_ms']:>8.2f}  {metrics['peak_kib']:>9.1f}"
+                )
+            return measured
+        finally:
+            teardown_databases(old_config, verbosity=0)
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+
+from greenshan.images import variant_paths
+from greenshan.models import Project, ProjectMedia
+from greenshan.tasks import VARIANT_FIELDS, build_variants, delete_unreferenced
+
+
+class Command(BaseCommand):
+    help = 'Generate responsive WebP/AVIF derivatives for existing covers and image media'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rebuild derivatives even if the manifest is up to date.',
+        )
+
+    def handle(self, *args, **options):
+        built = 0
+
+        querysets = [
+            Project.objects.exclude(cover=''),
+            ProjectMedia.objects.filter(media_type=ProjectMedia.MEDIA_IMAGE),
+        ]
+
+        for queryset in querysets:
+            label = queryset.model._meta.label_lower
+            file_field, manifest_field = VARIANT_FIELDS[label]
+
+            for obj in queryset.iterator():
+                fieldfile = getattr(obj, file_field)
+                manifest = getattr(obj, manifest_field)
+                if manifest.get('source') == fieldfile.name and not options['force']:
+                    continue
+
+                if options['force']:
+                    queryset.model.objects.filter(pk=obj.pk).update(**{manifest_field: {}})
+                    delete_unreferenced(fieldfile.storage, variant_paths(manifest))
+
+                try:
+                    # Never copy a sibling's manifest: --force may just have emptied it.
+                    build_variants(label, obj.pk, reuse=not options['force'])
+                except Exception as exc:
+                    self.stderr.write(f'{fieldfile.name}: {exc}')
+                    continue
+                built += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Built derivatives for {built} image(s).'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from greenshan import spool
+
+
+class Command(BaseCommand):
+    help = 'Load spooled contact submissions into the database (also run by run_jobs)'
+
+    def handle(self, *args, **options):
+        written = spool.flush()
+        self.stdout.write(self.style.SUCCESS(f'Inserted {written} contact submission(s).'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from greenshan import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the project full-text search index from scratch'
+
+    def handle(self, *args, **options):
+        if search.backend() is None:
+            self.stdout.write(self.style.WARNING('No full-text index on this database; search falls back to LIKE.'))
+            return
+
+        total = search.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {total} projects ({search.backend()}).'))
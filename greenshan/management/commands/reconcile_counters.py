@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from greenshan import stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the dashboard counters from the live tables'
+
+    def handle(self, *args, **options):
+        before = dict(stats.DashboardCounter.objects.values_list('name', 'value'))
+        after = stats.reconcile()
+
+        for name, value in after.items():
+            drift = value - before.get(name, 0)
+            note = f' (drift {drift:+d})' if drift else ''
+            self.stdout.write(f'{name}: {value}{note}')
+
+        self.stdout.write(self.style.SUCCESS('Dashboard counters reconciled.'))
@@ -0,0 +1,136 @@
+import multiprocessing
+import signal
+import time
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from greenshan import jobs, notifications, spool, uploads
+
+
+def _worker_main(index, poll_interval):
+    """
+    Child process entry point. A SIGTERM lets the current job finish.
+    """
+    if not apps.ready:
+        django.setup()
+
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *args: stopping.append(True))
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    jobs.worker_loop(index, poll_interval, lambda: bool(stopping))
+
+
+class Command(BaseCommand):
+    help = 'Run background job workers (thumbnails, metadata, file cleanup, contact spool, staff notifications)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=2,
+            help='Number of worker processes.',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Seconds an idle worker sleeps before polling again.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Drain runnable jobs in this process and exit (cron / tests).',
+        )
+        parser.add_argument(
+            '--keep-days',
+            type=int,
+            default=7,
+            help='Delete finished jobs older than this many days.',
+        )
+
+    def housekeeping(self, options):
+        jobs.requeue_stale()
+        jobs.purge_finished(options['keep_days'])
+        uploads.purge_expired()
+        notifications.purge(settings.NOTIFY_KEEP_DAYS)
+
+    def flush_spool(self):
+        # Also run when write-behind is off: drains what an earlier
+        # configuration (or a crash) left behind.
+        try:
+            spool.flush()
+        except Exception as exc:
+            self.stderr.write(f'Contact spool flush failed: {exc}')
+
+    def schedule_notifications(self):
+        # Jobs, not sends: a slow SMTP server or webhook only ever holds
+        # up a worker, never this loop.
+        try:
+            notifications.schedule()
+        except Exception as exc:
+            self.stderr.write(f'Notification scheduling failed: {exc}')
+
+    def handle(self, *args, **options):
+        self.housekeeping(options)
+        self.flush_spool()
+        self.schedule_notifications()
+
+        if options['once']:
+            count = jobs.run_pending()
+            self.stdout.write(self.style.SUCCESS(f'Ran {count} job(s).'))
+            return
+
+        stopping = []
+        signal.signal(signal.SIGTERM, lambda *args: stopping.append(True))
+        signal.signal(signal.SIGINT, lambda *args: stopping.append(True))
+
+        workers = {}
+
+        def spawn(index):
+            # Never share a database socket across a fork.
+            connections.close_all()
+            process = multiprocessing.Process(
+                target=_worker_main,
+                args=(index, options['poll_interval']),
+                daemon=True,
+            )
+            process.start()
+            workers[index] = process
+
+        for index in range(options['workers']):
+            spawn(index)
+
+        self.stdout.write(f'Started {len(workers)} worker(s).')
+
+        last_housekeeping = last_flush = last_digest = time.monotonic()
+        while not stopping:
+            time.sleep(options['poll_interval'])
+
+            if time.monotonic() - last_flush > settings.CONTACT_SPOOL_FLUSH_INTERVAL:
+                self.flush_spool()
+                last_flush = time.monotonic()
+
+            if time.monotonic() - last_digest > settings.NOTIFY_DIGEST_INTERVAL:
+                self.schedule_notifications()
+                last_digest = time.monotonic()
+
+            for index, process in list(workers.items()):
+                if not process.is_alive() and not stopping:
+                    self.stderr.write(f'Worker {index} exited ({process.exitcode}); restarting.')
+                    spawn(index)
+
+            if time.monotonic() - last_housekeeping > 60:
+                self.housekeeping(options)
+                last_housekeeping = time.monotonic()
+
+        for process in workers.values():
+            process.terminate()
+        for process in workers.values():
+            process.join()
+
+        self.stdout.write(self.style.SUCCESS('Workers stopped.'))
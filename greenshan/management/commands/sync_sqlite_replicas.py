@@ -0,0 +1,33 @@
+import sqlite3
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from greenshan.routers import PRIMARY, replicas
+
+
+class Command(BaseCommand):
+    help = 'Copy the SQLite primary onto each SQLite read replica (local replica testing)'
+
+    def handle(self, *args, **options):
+        primary = connections[PRIMARY]
+        if primary.vendor != 'sqlite':
+            raise CommandError('The primary is not SQLite; use database replication instead.')
+
+        aliases = [alias for alias in replicas() if connections[alias].vendor == 'sqlite']
+        if not aliases:
+            self.stdout.write(self.style.WARNING('No SQLite replicas configured (DATABASE_REPLICA_URLS).'))
+            return
+
+        primary.ensure_connection()
+        for alias in aliases:
+            connections[alias].close()
+            # Online backup: a consistent snapshot even while the site writes.
+            target = sqlite3.connect(str(connections[alias].settings_dict['NAME']))
+            try:
+                primary.connection.backup(target)
+            finally:
+                target.close()
+            self.stdout.write(f'{alias}: copied from {PRIMARY}.')
+
+        self.stdout.write(self.style.SUCCESS(f'Synced {len(aliases)} replica(s).'))
@@ -0,0 +1,43 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+
+# =================================================
+# STATIC FILES
+# =================================================
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise that also runs natively under ASGI. The stock middleware
+    is sync-only, so Django would push every request (static or not)
+    through a thread hop before it reached an async view. The static
+    lookup is an in-memory dict hit, safe to do on the event loop.
+
+    lookup() mirrors WhiteNoiseMiddleware.__call__ and uses its
+    internals, so requirements.txt pins whitenoise exactly; upgrade it
+    together with this class (AsyncPublicViewTests covers a static hit).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        static_file = self.lookup(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
+
+    def lookup(self, path):
+        if self.autorefresh:
+            return self.find_file(path)
+        return self.files.get(path)
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-17 12:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('greenshan', '0004_portfolio_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='projectmedia',
+            name='updated',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.1 on 2026-10-17 13:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('greenshan', '0006_dashboard_counter'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contactrequest',
+            index=models.Index(fields=['-created', '-id'], name='contact_inbox_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactrequest',
+            index=models.Index(fields=['handled', '-created', '-id'], name='contact_inbox_status_idx'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 6.0.1 on 2026-10-17 14:05
+
+from django.db import migrations
+
+# The index lives outside the ORM: an FTS5 virtual table on SQLite, a
+# tsvector column + GIN index on PostgreSQL (see greenshan/search.py).
+
+FIELDS = "title, client, location, description, experience_notes"
+
+POSTGRES_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(client, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(location, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C') || "
+    "setweight(to_tsvector('english', coalesce(experience_notes, '')), 'D')"
+)
+
+
+def create_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE greenshan_project_fts USING fts5("
+            f"{FIELDS}, tokenize='porter unicode61')"
+        )
+        schema_editor.execute(
+            f"INSERT INTO greenshan_project_fts (rowid, {FIELDS}) "
+            f"SELECT id, {FIELDS} FROM greenshan_project"
+        )
+    elif vendor == "postgresql":
+        schema_editor.execute("ALTER TABLE greenshan_project ADD COLUMN search_vector tsvector")
+        schema_editor.execute(f"UPDATE greenshan_project SET search_vector = {POSTGRES_VECTOR}")
+        schema_editor.execute(
+            "CREATE INDEX greenshan_project_search_idx "
+            "ON greenshan_project USING GIN (search_vector)"
+        )
+
+
+def drop_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS greenshan_project_fts")
+    elif vendor == "postgresql":
+        schema_editor.execute("ALTER TABLE greenshan_project DROP COLUMN IF EXISTS search_vector")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('greenshan', '0007_contact_inbox_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 6.0.1 on 2026-10-18 15:40
+
+from django.db import migrations
+
+# The portfolio orders by project_date DESC NULLS LAST (pagination.py).
+# A plain DESC index sorts NULLs first on PostgreSQL, so the planner
+# can't walk it for that order; rebuild it with the same NULL placement.
+# SQLite already sorts NULLs last on DESC and rejects NULLS LAST in an
+# index, so it keeps the index from 0004.
+
+INDEX = "project_portfolio_idx"
+
+
+def nulls_last(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX}")
+        schema_editor.execute(
+            f"CREATE INDEX {INDEX} ON greenshan_project "
+            f"(project_date DESC NULLS LAST, created DESC, id DESC)"
+        )
+
+
+def nulls_first(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX}")
+        schema_editor.execute(
+            f"CREATE INDEX {INDEX} ON greenshan_project "
+            f"(project_date DESC, created DESC, id DESC)"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('greenshan', '0011_notifications'),
+    ]
+
+    operations = [
+        migrations.RunPython(nulls_last, nulls_first),
+    ]
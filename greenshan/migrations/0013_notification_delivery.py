@@ -0,0 +1,49 @@
+# Generated by Django 6.0.1 on 2026-10-18 16:20
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def cursors_to_deliveries(apps, schema_editor):
+    """
+    Everything up to a transport's old cursor counts as delivered, so
+    upgrading doesn't re-send the backlog.
+    """
+    Notification = apps.get_model('greenshan', 'Notification')
+    NotificationCursor = apps.get_model('greenshan', 'NotificationCursor')
+    NotificationDelivery = apps.get_model('greenshan', 'NotificationDelivery')
+
+    for cursor in NotificationCursor.objects.all():
+        ids = Notification.objects.filter(pk__lte=cursor.last_id).values_list('pk', flat=True)
+        NotificationDelivery.objects.bulk_create(
+            (NotificationDelivery(notification_id=pk, transport=cursor.transport) for pk in ids.iterator()),
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('greenshan', '0012_portfolio_index_nulls_last'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationDelivery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('transport', models.CharField(max_length=60)),
+                ('delivered', models.DateTimeField(default=django.utils.timezone.now)),
+                ('notification', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to='greenshan.notification')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='notificationdelivery',
+            constraint=models.UniqueConstraint(fields=('transport', 'notification'), name='notification_delivery_unique'),
+        ),
+        migrations.RunPython(cursors_to_deliveries, migrations.RunPython.noop),
+        migrations.DeleteModel(
+            name='NotificationCursor',
+        ),
+    ]
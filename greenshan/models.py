@@ -1,14 +1,26 @@
-from django.db import models
+from django.conf import settings
+from django.db import connections, models, router, transaction, IntegrityError
+from django.db.models import Case, Q, When
+from django.db.models.functions import Length
 from django.urls import reverse
 from django.utils.text import slugify
 from django.core.exceptions import ValidationError
+from django.utils import timezone
+import mimetypes
 import os
+import re
+import uuid
+
+from .images import ResponsiveImage
+from .sniffing import FORMAT_EXTENSIONS, IMAGE_FORMATS, HeaderReader, image_size, sniff
 
 # =================================================
 # CONSTANTS & VALIDATION
 # =================================================
 
 MAX_MEDIA_SIZE = 100 * 1024 * 1024  # 100 MB
+MAX_MEDIA_PER_PROJECT = 10
+MAX_IMAGE_PIXELS = 60 * 1000 * 1000  # ~240 MB once decoded to RGBA
 
 ALLOWED_EXTENSIONS = {
     "image": ["jpg", "jpeg", "png", "webp", "gif"],
@@ -18,11 +30,15 @@ ALLOWED_EXTENSIONS = {
 }
 
 
-def validate_file_size(file):
-    if file.size > MAX_MEDIA_SIZE:
+def validate_upload_size(size):
+    if size > MAX_MEDIA_SIZE:
         raise ValidationError("File size exceeds 100MB limit.")
 
 
+def validate_file_size(file):
+    validate_upload_size(file.size)
+
+
 def validate_file_extension(file, media_type):
     ext = os.path.splitext(file.name)[1][1:].lower()
     allowed = ALLOWED_EXTENSIONS.get(media_type, [])
@@ -33,6 +49,30 @@ def validate_file_extension(file, media_type):
         )
 
 
+def validate_file_content(file, media_type):
+    """
+    Check the real type from the header bytes (and, for images, the
+    pixel dimensions) without reading or decoding the whole file.
+    Uses the bytes the upload handler captured in flight when present.
+    """
+    reader = HeaderReader(file, getattr(file, "header", b""))
+    fmt = sniff(reader.head)
+    ext = os.path.splitext(file.name)[1][1:].lower()
+
+    if fmt is None or ext not in FORMAT_EXTENSIONS[fmt]:
+        raise ValidationError(f"File contents do not match a .{ext} {media_type} file.")
+
+    if media_type == "image":
+        size = image_size(reader, fmt) if fmt in IMAGE_FORMATS else None
+        if not size or not all(size):
+            raise ValidationError("Upload a valid image file.")
+        if size[0] * size[1] > MAX_IMAGE_PIXELS:
+            raise ValidationError(
+                f"Image is {size[0]}×{size[1]}; the limit is "
+                f"{MAX_IMAGE_PIXELS // 1000000} megapixels."
+            )
+
+
 # =================================================
 # UPLOAD PATH HELPERS (SINGLE SOURCE OF TRUTH)
 # =================================================
@@ -47,6 +87,86 @@ def upload_to_project_media(instance, filename):
     return f"projects/{slug}/media/{filename}"
 
 
+# =================================================
+# SLUG HELPERS
+# =================================================
+
+SLUG_SAVE_ATTEMPTS = 5
+SLUG_CANDIDATES = 10
+
+
+def next_slug_suffix(model, base):
+    """
+    Next free numeric suffix for ``base`` (0 means ``base`` itself is
+    free), in one query whose cost does not grow with the duplicates.
+
+    [base-0, base-:) is an index range holding only slugs with a digit
+    after the dash (':' sorts right after '9'). Among those the longest,
+    then lexically largest, is the highest number, so the database only
+    hands back a few rows however many "corporate-video-N" exist.
+    """
+    rows = list(
+        model.objects.filter(Q(slug=base) | Q(slug__gte=f"{base}-0", slug__lt=f"{base}-:"))
+        .order_by(
+            Case(When(slug=base, then=0), default=1),
+            Length("slug").desc(),
+            "-slug",
+        )
+        .values_list("slug", flat=True)[: SLUG_CANDIDATES + 1]
+    )
+    if not rows or rows[0] != base:
+        return 0
+
+    pattern = re.compile(rf"^{re.escape(base)}-(\d+)$")
+    for slug in rows[1:]:
+        match = pattern.match(slug)
+        if match:
+            return int(match.group(1)) + 1
+
+    if len(rows) > SLUG_CANDIDATES:
+        # Only look-alikes such as "reel-2-teaser" so far: check them all.
+        taken = model.objects.filter(slug__gte=f"{base}-0", slug__lt=f"{base}-:")
+        numbers = [
+            int(match.group(1))
+            for match in map(pattern.match, taken.values_list("slug", flat=True))
+            if match
+        ]
+        return max(numbers, default=0) + 1
+    return 1
+
+
+def _with_suffix(base, suffix, max_length):
+    if not suffix:
+        return base[:max_length]
+    tail = f"-{suffix}"
+    return f"{base[:max_length - len(tail)]}{tail}"
+
+
+def allocate_slugs(objs, source_field="title"):
+    """
+    Fill ``slug`` on unsaved instances without saving them, for import
+    paths that bypass save() (e.g. ``Project.objects.bulk_create``).
+    One query per distinct title, not per object.
+    """
+    if not objs:
+        return objs
+
+    model = type(objs[0])
+    max_length = model._meta.get_field("slug").max_length
+    next_free = {}
+
+    for obj in objs:
+        if obj.slug:
+            continue
+        base = slugify(getattr(obj, source_field))[: max_length - 8] or model._meta.model_name
+        if base not in next_free:
+            next_free[base] = next_slug_suffix(model, base)
+        obj.slug = _with_suffix(base, next_free[base], max_length)
+        next_free[base] += 1
+
+    return objs
+
+
 # =================================================
 # PROJECT MODEL
 # =================================================
@@ -83,11 +203,14 @@ class Project(models.Model):
         blank=True,
     )
 
+    cover_variants = models.JSONField(default=dict, blank=True, editable=False)
+
     description = models.TextField(blank=True)
     experience_notes = models.TextField(blank=True)
 
     featured = models.BooleanField(default=False, db_index=True)
     created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         ordering = ["-project_date", "-created"]
@@ -95,6 +218,9 @@ class Project(models.Model):
             models.Index(fields=["featured"]),
             models.Index(fields=["category"]),
             models.Index(fields=["created"]),
+            # DESC NULLS LAST on PostgreSQL (migration 0012), to match
+            # the portfolio ordering.
+            models.Index(fields=["-project_date", "-created", "-id"], name="project_portfolio_idx"),
         ]
 
     def __str__(self):
@@ -103,19 +229,24 @@ class Project(models.Model):
     def save(self, *args, **kwargs):
         """
         Auto-generate unique slug if not provided.
-        """
-        if not self.slug:
-            base_slug = slugify(self.title)
-            slug = base_slug
-            counter = 1
 
-            while Project.objects.filter(slug=slug).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-
-            self.slug = slug
-
-        super().save(*args, **kwargs)
+        The free suffix is found with a single query. If a concurrent
+        save claims it first, the unique index rejects ours and we
+        allocate again inside a savepoint.
+        """
+        if self.slug:
+            return super().save(*args, **kwargs)
+
+        for attempt in range(SLUG_SAVE_ATTEMPTS):
+            allocate_slugs([self])
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                slug_taken = Project.objects.filter(slug=self.slug).exists()
+                self.slug = ""
+                if not slug_taken or attempt == SLUG_SAVE_ATTEMPTS - 1:
+                    raise
 
     def get_absolute_url(self):
         return reverse(
@@ -123,6 +254,10 @@ class Project(models.Model):
             kwargs={"slug": self.slug},
         )
 
+    @property
+    def cover_image(self):
+        return ResponsiveImage(self.cover, self.cover_variants)
+
 
 # =================================================
 # PROJECT MEDIA MODEL
@@ -156,7 +291,9 @@ class ProjectMedia(models.Model):
 
     caption = models.CharField(max_length=250, blank=True)
     order = models.PositiveIntegerField(default=0, db_index=True)
+    variants = models.JSONField(default=dict, blank=True, editable=False)
     created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["order", "created"]
@@ -172,11 +309,18 @@ class ProjectMedia(models.Model):
         if self.file:
             validate_file_size(self.file)
             validate_file_extension(self.file, self.media_type)
+            if not self.file._committed:
+                # Fresh uploads only; stored files were checked on the way in.
+                validate_file_content(self.file.file, self.media_type)
 
     @property
     def filename(self):
         return os.path.basename(self.file.name)
 
+    @property
+    def mime_type(self):
+        return mimetypes.guess_type(self.file.name)[0] or ""
+
     # 🔹 Media helpers for templates
     @property
     def is_image(self):
@@ -190,6 +334,10 @@ class ProjectMedia(models.Model):
     def is_audio(self):
         return self.media_type == self.MEDIA_AUDIO
 
+    @property
+    def image(self):
+        return ResponsiveImage(self.file, self.variants)
+
 
 # =================================================
 # TESTIMONIAL MODEL
@@ -229,16 +377,215 @@ class Service(models.Model):
 # CONTACT REQUEST MODEL
 # =================================================
 
+class ContactRequestQuerySet(models.QuerySet):
+
+    def bulk_delete(self):
+        """
+        Delete the selection with one DELETE ... WHERE pk IN (SELECT ...)
+        and return the row count. Unlike delete() it loads no rows and
+        sends no post_delete, so callers adjust the dashboard counters
+        themselves. Nothing references ContactRequest, so nothing cascades.
+        """
+        using = router.db_for_write(self.model)
+        connection = connections[using]
+        select, params = self.order_by().values("pk").query.get_compiler(using).as_sql()
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        column = connection.ops.quote_name(self.model._meta.pk.column)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table} WHERE {column} IN ({select})", params)
+            return cursor.rowcount
+
+
 class ContactRequest(models.Model):
     name = models.CharField(max_length=200)
     email = models.EmailField()
     subject = models.CharField(max_length=250, blank=True)
     message = models.TextField()
-    created = models.DateTimeField(auto_now_add=True)
+    # Not auto_now_add: spooled submissions keep the time they were sent.
+    created = models.DateTimeField(default=timezone.now, editable=False)
     handled = models.BooleanField(default=False, db_index=True)
+    # Set by the write-behind spool; makes replaying a spool file idempotent.
+    spool_id = models.UUIDField(null=True, blank=True, unique=True, editable=False)
+
+    objects = ContactRequestQuerySet.as_manager()
 
     class Meta:
         ordering = ["-created"]
+        indexes = [
+            models.Index(fields=["-created", "-id"], name="contact_inbox_idx"),
+            models.Index(fields=["handled", "-created", "-id"], name="contact_inbox_status_idx"),
+        ]
 
     def __str__(self):
         return f"{self.name} — {self.email}"
+
+
+# =================================================
+# BACKGROUND JOB MODEL
+# =================================================
+
+class Job(models.Model):
+    """
+    Database-backed work item drained by ``manage.py run_jobs``.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    DEAD = "dead"
+
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (DEAD, "Dead"),
+    ]
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=QUEUED,
+    )
+
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    created = models.DateTimeField(auto_now_add=True)
+    finished = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["run_after", "id"]
+        indexes = [
+            models.Index(fields=["status", "run_after"]),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} — {self.status}"
+
+
+# =================================================
+# DASHBOARD COUNTER MODEL
+# =================================================
+
+class DashboardCounter(models.Model):
+    """
+    Signal-maintained count shown on the staff dashboard
+    (see greenshan.stats; enabled with DASHBOARD_COUNTERS).
+    """
+
+    name = models.CharField(max_length=60, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name} = {self.value}"
+
+
+# =================================================
+# CHUNKED UPLOAD SESSION MODEL
+# =================================================
+
+class UploadSession(models.Model):
+    """
+    A resumable ProjectMedia upload in progress (see greenshan.uploads).
+    Bytes live in a temp file; this row tracks how many have arrived.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    project = models.ForeignKey(
+        Project,
+        related_name="upload_sessions",
+        on_delete=models.CASCADE,
+    )
+    uploaded_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+    )
+
+    filename = models.CharField(max_length=255)
+    media_type = models.CharField(max_length=20, choices=ProjectMedia.MEDIA_CHOICES)
+    caption = models.CharField(max_length=250, blank=True)
+
+    size = models.BigIntegerField()
+    received = models.BigIntegerField(default=0)
+    block_digests = models.JSONField(default=list, blank=True)
+
+    created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        ordering = ["-created"]
+
+    def __str__(self):
+        return f"{self.filename} — {self.received}/{self.size}"
+
+    @property
+    def complete(self):
+        return self.received == self.size
+
+
+# =================================================
+# STAFF NOTIFICATION MODELS
+# =================================================
+
+class Notification(models.Model):
+    """
+    Outbox entry for a staff-facing event, written by signals in the
+    same transaction as the row it describes and delivered in digests
+    by the job queue (see greenshan.notifications).
+    """
+
+    CONTACT = "contact"
+    UPLOAD = "upload"
+
+    EVENT_CHOICES = [
+        (CONTACT, "New contact request"),
+        (UPLOAD, "New upload"),
+    ]
+
+    event = models.CharField(max_length=20, choices=EVENT_CHOICES)
+    summary = models.CharField(max_length=300)
+    url = models.CharField(max_length=300, blank=True)
+    created = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self):
+        return f"{self.event}: {self.summary}"
+
+
+class NotificationDelivery(models.Model):
+    """
+    One Notification sent through one transport. Transports deliver
+    independently, so a failing webhook never re-sends mail. Rows rather
+    than a high-water id: PostgreSQL ids commit out of order, and a
+    cursor could step over an event whose transaction was still open.
+    """
+
+    notification = models.ForeignKey(
+        Notification,
+        on_delete=models.CASCADE,
+        related_name="deliveries",
+    )
+    transport = models.CharField(max_length=60)
+    delivered = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["transport", "notification"],
+                name="notification_delivery_unique",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.notification_id} via {self.transport}"
@@ -0,0 +1,245 @@
+import hashlib
+import hmac
+import json
+import os
+import sys
+import urllib.request
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from django.utils.text import Truncator
+
+from .jobs import enqueue, task
+from .models import Job, Notification, NotificationDelivery
+
+# =================================================
+# STAFF NOTIFICATIONS
+# =================================================
+# Signals write a Notification row next to the contact request / upload
+# that caused it (one INSERT, no network). run_jobs periodically queues
+# a "notifications.digest" job per transport; the worker sends every
+# undelivered event in one message and records a NotificationDelivery
+# per event. A failed send raises, so the job queue retries it with
+# exponential backoff (JOBS_RETRY_BACKOFF) up to NOTIFY_MAX_ATTEMPTS.
+# Delivery is at-least-once: a crash between sending and recording the
+# deliveries repeats that digest.
+
+DIGEST_JOB = "notifications.digest"
+
+EVENT_LABELS = {
+    Notification.CONTACT: ("new contact request", "new contact requests"),
+    Notification.UPLOAD: ("new upload", "new uploads"),
+}
+
+
+def transports():
+    return getattr(settings, "NOTIFY_TRANSPORTS", {})
+
+
+def enabled():
+    return bool(transports())
+
+
+def get_transport(name):
+    config = dict(transports()[name])
+    return import_string(config.pop("BACKEND"))(**config)
+
+
+def absolute(url):
+    return f"{getattr(settings, 'SITE_URL', '').rstrip('/')}{url}"
+
+
+# ---------------------------------------------
+# Recording (request path: database only)
+# ---------------------------------------------
+
+def contact_notification(contact):
+    return Notification(
+        event=Notification.CONTACT,
+        summary=Truncator(f"{contact.name} <{contact.email}>: {contact.subject or contact.message}").chars(300),
+        url=reverse("greenshan:message_detail", args=[contact.pk]) if contact.pk else "",
+        created=contact.created,
+    )
+
+
+def upload_notification(media):
+    return Notification(
+        event=Notification.UPLOAD,
+        summary=Truncator(
+            f"{os.path.basename(media.file.name)} ({media.get_media_type_display()})"
+        ).chars(300),
+        url=reverse("greenshan:manage_edit", args=[media.project_id]),
+    )
+
+
+def record(notifications):
+    notifications = list(notifications)
+    if enabled() and notifications:
+        Notification.objects.bulk_create(notifications)
+
+
+# ---------------------------------------------
+# Digests
+# ---------------------------------------------
+
+class Digest:
+    def __init__(self, events):
+        self.events = events
+
+    @property
+    def subject(self):
+        counts = Counter(event.event for event in self.events)
+        parts = [
+            f"{count} {EVENT_LABELS[name][count != 1]}"
+            for name, count in counts.items()
+        ]
+        return f"GreenShan: {', '.join(parts)}"
+
+    def text(self):
+        lines = []
+        for event in self.events:
+            stamp = timezone.localtime(event.created).strftime("%d %b %H:%M")
+            lines.append(f"[{stamp}] {event.summary}")
+            if event.url:
+                lines.append(f"    {absolute(event.url)}")
+        return "\n".join(lines)
+
+    def payload(self):
+        return {
+            "subject": self.subject,
+            "events": [
+                {
+                    "id": event.pk,
+                    "event": event.event,
+                    "summary": event.summary,
+                    "url": absolute(event.url) if event.url else "",
+                    "created": event.created.isoformat(),
+                }
+                for event in self.events
+            ],
+        }
+
+
+def undelivered(transport):
+    return Notification.objects.exclude(deliveries__transport=transport)
+
+
+@task(DIGEST_JOB)
+def send_digest(transport):
+    """
+    Send everything ``transport`` hasn't delivered yet, in digests of at
+    most NOTIFY_DIGEST_MAX events. Raises (and is retried) on failure.
+    """
+    backend = get_transport(transport)
+    size = getattr(settings, "NOTIFY_DIGEST_MAX", 100)
+
+    while True:
+        events = list(undelivered(transport)[:size])
+        if not events:
+            return
+        backend.send(Digest(events))
+        NotificationDelivery.objects.bulk_create(
+            [NotificationDelivery(notification=event, transport=transport) for event in events],
+            ignore_conflicts=True,
+        )
+
+
+def schedule():
+    """
+    Queue a digest for each transport with undelivered events, unless
+    one is already queued or retrying. Returns the number queued.
+    """
+    busy = set(
+        Job.objects.filter(name=DIGEST_JOB, status__in=[Job.QUEUED, Job.RUNNING])
+        .values_list("payload__transport", flat=True)
+    )
+
+    queued = 0
+    for name in transports():
+        if name not in busy and undelivered(name).exists():
+            enqueue(DIGEST_JOB, max_attempts=getattr(settings, "NOTIFY_MAX_ATTEMPTS", 8), transport=name)
+            queued += 1
+    return queued
+
+
+def purge(days):
+    """
+    Drop events older than ``days`` that every transport has delivered.
+    """
+    cutoff = timezone.now() - timedelta(days=days)
+    old = Notification.objects.filter(created__lt=cutoff)
+    for name in transports():
+        # One join per transport: delivered through each of them.
+        old = old.filter(deliveries__transport=name)
+    _, deleted = old.delete()
+    return deleted.get(Notification._meta.label, 0)
+
+
+# =================================================
+# TRANSPORTS
+# =================================================
+# NOTIFY_TRANSPORTS = {name: {"BACKEND": dotted path, **options}}; any
+# class with send(digest) works.
+
+class EmailTransport:
+    """
+    SMTP through Django's EMAIL_* settings.
+    """
+
+    def __init__(self, recipients, from_email=None):
+        self.recipients = list(recipients)
+        self.from_email = from_email
+
+    def send(self, digest):
+        EmailMessage(digest.subject, digest.text(), self.from_email, self.recipients).send()
+
+
+class WebhookTransport:
+    """
+    POSTs the digest as JSON. With ``secret`` the body is signed:
+    X-Greenshan-Signature: sha256=<hex HMAC>.
+    """
+
+    def __init__(self, url, secret="", timeout=10):
+        self.url = url
+        self.secret = secret
+        self.timeout = timeout
+
+    def send(self, digest):
+        body = json.dumps(digest.payload()).encode()
+        request = urllib.request.Request(
+            self.url,
+            data=body,
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        if self.secret:
+            signature = hmac.new(self.secret.encode(), body, hashlib.sha256).hexdigest()
+            request.add_header("X-Greenshan-Signature", f"sha256={signature}")
+        # Non-2xx raises HTTPError, which fails (and retries) the job.
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class FileTransport:
+    """
+    Appends digests to ``path``, or prints them for "-". A stand-in for
+    development and tests.
+    """
+
+    def __init__(self, path="-"):
+        self.path = str(path)
+
+    def send(self, digest):
+        text = f"Subject: {digest.subject}\n\n{digest.text()}\n\n"
+        if self.path == "-":
+            sys.stdout.write(text)
+            sys.stdout.flush()
+            return
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(text)
@@ -0,0 +1,119 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+
+
+# =================================================
+# KEYSET (CURSOR) PAGINATION
+# =================================================
+
+class KeysetPage:
+    def __init__(self, items, next_cursor):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+class KeysetPaginator:
+    """
+    Cursor pagination over a descending ordering, e.g.
+    ("project_date", "created", "id"). Each page is one indexed range
+    query, so page 500 costs the same as page 1 (unlike OFFSET).
+    Nullable keys sort last on every backend; the index behind the
+    ordering must place NULLs the same way (see migration 0012).
+    """
+
+    def __init__(self, queryset, keys, per_page):
+        self.queryset = queryset
+        self.keys = keys
+        self.per_page = per_page
+        self.fields = [queryset.model._meta.get_field(key) for key in keys]
+
+    @property
+    def ordering(self):
+        return [F(key).desc(nulls_last=True) for key in self.keys]
+
+    # ---------------------------------------------
+    # Cursor encoding
+    # ---------------------------------------------
+
+    def encode(self, obj):
+        values = [
+            field.value_to_string(obj) if getattr(obj, field.attname) is not None else None
+            for field in self.fields
+        ]
+        raw = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode(self, cursor):
+        """
+        Returns the key values, or None for a missing/garbled cursor.
+        """
+        if not cursor:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            values = json.loads(raw)
+            if len(values) != len(self.fields):
+                return None
+            return [
+                field.to_python(value) if value is not None else None
+                for field, value in zip(self.fields, values)
+            ]
+        except (ValueError, TypeError, ValidationError):
+            return None
+
+    # ---------------------------------------------
+    # Query building
+    # ---------------------------------------------
+
+    def _equal(self, field, value):
+        if value is None:
+            return Q(**{f"{field.name}__isnull": True})
+        return Q(**{field.name: value})
+
+    def _after(self, field, value):
+        if value is None:
+            # NULLs sort last: nothing comes after them on this key.
+            return None
+        condition = Q(**{f"{field.name}__lt": value})
+        if field.null:
+            condition |= Q(**{f"{field.name}__isnull": True})
+        return condition
+
+    def filter_after(self, values):
+        condition = Q(pk__in=[])
+        prefix = Q()
+        for field, value in zip(self.fields, values):
+            after = self._after(field, value)
+            if after is not None:
+                condition |= prefix & after
+            prefix &= self._equal(field, value)
+        return condition
+
+    def page_queryset(self, cursor=None):
+        queryset = self.queryset.order_by(*self.ordering)
+        values = self.decode(cursor)
+        if values is not None:
+            queryset = queryset.filter(self.filter_after(values))
+        return queryset[: self.per_page + 1]
+
+    def page(self, cursor=None):
+        return self.build_page(list(self.page_queryset(cursor)))
+
+    async def apage(self, cursor=None):
+        return self.build_page([obj async for obj in self.page_queryset(cursor)])
+
+    def build_page(self, items):
+        has_next = len(items) > self.per_page
+        items = items[: self.per_page]
+
+        return KeysetPage(
+            items,
+            self.encode(items[-1]) if has_next else None,
+        )
@@ -0,0 +1,226 @@
+import itertools
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+PRIMARY = "default"
+
+# Set on any response whose request wrote; while present, that browser
+# reads from the primary (read-your-writes across replica lag).
+STICKY_COOKIE = "gs_primary"
+
+LAG_CHECK_INTERVAL = 5   # seconds between lag probes of one replica
+
+# Seconds the replica is behind the primary; 0 when fully replayed.
+POSTGRES_LAG_SQL = """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+# Alias chosen for the current public view; None = primary.
+_read_alias = ContextVar("greenshan_read_alias", default=None)
+# Per-request list the router appends to when a greenshan model is written.
+_request_writes = ContextVar("greenshan_request_writes", default=None)
+
+_round_robin = itertools.count()
+_lag = {}   # alias -> (measured at, seconds behind or None if unreachable)
+
+
+# =================================================
+# REPLICA SELECTION
+# =================================================
+
+def replicas():
+    return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+
+def _measure_lag(alias):
+    connection = connections[alias]
+    if connection.vendor != "postgresql":
+        # SQLite replicas are file copies (sync_sqlite_replicas): no stream to lag.
+        return 0.0
+    with connection.cursor() as cursor:
+        cursor.execute(POSTGRES_LAG_SQL)
+        return float(cursor.fetchone()[0] or 0)
+
+
+def replica_lag(alias):
+    """
+    Seconds ``alias`` is behind the primary, probed at most every
+    LAG_CHECK_INTERVAL per process; None if it can't be reached.
+    """
+    measured = _lag.get(alias)
+    if measured and time.monotonic() - measured[0] < LAG_CHECK_INTERVAL:
+        return measured[1]
+
+    try:
+        lag = _measure_lag(alias)
+    except DatabaseError:
+        lag = None
+    _lag[alias] = (time.monotonic(), lag)
+    return lag
+
+
+def choose_replica():
+    """
+    The alias public reads go to: "round_robin" spreads load evenly,
+    "least_lag" picks the freshest replica within DATABASE_REPLICA_MAX_LAG.
+    Falls back to the primary when no replica qualifies.
+    """
+    aliases = replicas()
+    if not aliases:
+        return PRIMARY
+
+    if getattr(settings, "DATABASE_REPLICA_SELECTION", "round_robin") == "least_lag":
+        max_lag = getattr(settings, "DATABASE_REPLICA_MAX_LAG", 5)
+        candidates = []
+        for alias in aliases:
+            lag = replica_lag(alias)
+            if lag is not None and lag <= max_lag:
+                candidates.append((lag, alias))
+        return min(candidates)[1] if candidates else PRIMARY
+
+    return aliases[next(_round_robin) % len(aliases)]
+
+
+# =================================================
+# VIEW DECORATOR & MIDDLEWARE
+# =================================================
+
+def is_sticky(request):
+    return STICKY_COOKIE in request.COOKIES
+
+
+def replica_reads(view_func):
+    """
+    Route this view's greenshan reads to a replica (one per request, so
+    a page is rendered from a single snapshot). Browsers that just wrote
+    stay on the primary.
+    """
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD") or is_sticky(request):
+                return await view_func(request, *args, **kwargs)
+
+            # Only a least-lag probe touches the database.
+            if getattr(settings, "DATABASE_REPLICA_SELECTION", "round_robin") == "least_lag":
+                alias = await sync_to_async(choose_replica)()
+            else:
+                alias = choose_replica()
+
+            # The async ORM copies this context into its worker thread.
+            token = _read_alias.set(alias)
+            try:
+                return await view_func(request, *args, **kwargs)
+            finally:
+                _read_alias.reset(token)
+
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD") or is_sticky(request):
+            return view_func(request, *args, **kwargs)
+
+        token = _read_alias.set(choose_replica())
+        try:
+            response = view_func(request, *args, **kwargs)
+            # Lazy TemplateResponses must query inside the routed scope.
+            if hasattr(response, "render") and not response.is_rendered:
+                response.render()
+            return response
+        finally:
+            _read_alias.reset(token)
+
+    return wrapper
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Pin a browser to the primary for DATABASE_REPLICA_STICKY_SECONDS
+    after any request that wrote greenshan data (contact form, staff
+    saves), so it never reads back a replica older than its own write.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        writes = []
+        token = _request_writes.set(writes)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_writes.reset(token)
+        return self.pin(response, writes)
+
+    async def __acall__(self, request):
+        writes = []
+        token = _request_writes.set(writes)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_writes.reset(token)
+        return self.pin(response, writes)
+
+    def pin(self, response, writes):
+        if writes and replicas():
+            response.set_cookie(
+                STICKY_COOKIE,
+                "1",
+                max_age=getattr(settings, "DATABASE_REPLICA_STICKY_SECONDS", 15),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+# =================================================
+# ROUTER
+# =================================================
+
+class ReplicaRouter:
+    """
+    Greenshan writes, and reads outside @replica_reads views (manage/,
+    admin, jobs, commands), always use the primary. Other apps (auth,
+    sessions) are left on the primary too.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == "greenshan":
+            return _read_alias.get()
+        return None
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label == "greenshan":
+            writes = _request_writes.get()
+            if writes is not None:
+                writes.append(model._meta.label_lower)
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        pool = {PRIMARY, *replicas()}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        # Replicas receive the schema from the primary (replication / sync).
+        if db in replicas():
+            return False
+        return None
@@ -0,0 +1,148 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import Project
+
+# =================================================
+# PROJECT FULL-TEXT SEARCH
+# =================================================
+# SQLite: an FTS5 table keyed by project id (rowid).
+# PostgreSQL: a weighted tsvector column with a GIN index.
+# Both are created by migration 0008 and kept current by signals;
+# `manage.py rebuild_search_index` repopulates them after bulk imports.
+
+SEARCH_FIELDS = ("title", "client", "location", "description", "experience_notes")
+
+# Relative importance, in SEARCH_FIELDS order.
+SQLITE_WEIGHTS = (10.0, 5.0, 3.0, 1.0, 1.0)
+POSTGRES_WEIGHTS = ("A", "B", "B", "C", "D")
+
+FTS_TABLE = "greenshan_project_fts"
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+POSTGRES_VECTOR_SQL = " || ".join(
+    f"setweight(to_tsvector('english', coalesce({field}, '')), '{weight}')"
+    for field, weight in zip(SEARCH_FIELDS, POSTGRES_WEIGHTS)
+)
+
+
+def backend():
+    return connection.vendor if connection.vendor in ("sqlite", "postgresql") else None
+
+
+# ---------------------------------------------
+# Incremental maintenance
+# ---------------------------------------------
+
+def index_project(project):
+    vendor = backend()
+    if vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [project.pk])
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(SEARCH_FIELDS)}) "
+                f"VALUES (%s, {', '.join(['%s'] * len(SEARCH_FIELDS))})",
+                [project.pk] + [getattr(project, field) or "" for field in SEARCH_FIELDS],
+            )
+    elif vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE greenshan_project SET search_vector = {POSTGRES_VECTOR_SQL} WHERE id = %s",
+                [project.pk],
+            )
+
+
+def remove_project(pk):
+    # PostgreSQL's vector lives on the row itself and goes with it.
+    if backend() == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [pk])
+
+
+def rebuild():
+    """
+    Repopulate the whole index in one statement per step.
+    """
+    vendor = backend()
+    with connection.cursor() as cursor:
+        if vendor == "sqlite":
+            columns = ", ".join(SEARCH_FIELDS)
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, {columns}) "
+                f"SELECT id, {columns} FROM greenshan_project"
+            )
+            cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+        elif vendor == "postgresql":
+            cursor.execute(f"UPDATE greenshan_project SET search_vector = {POSTGRES_VECTOR_SQL}")
+    return Project.objects.count()
+
+
+# ---------------------------------------------
+# Querying
+# ---------------------------------------------
+
+def _fts5_query(text):
+    """
+    Turn free text into an FTS5 expression: every word must match,
+    the last one as a prefix (search-as-you-type). Quoting each token
+    keeps user input from being parsed as FTS5 syntax.
+    """
+    tokens = TOKEN_RE.findall(text)
+    if not tokens:
+        return ""
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def search_ids(text, limit=50):
+    """
+    Project ids best match first.
+    """
+    text = (text or "").strip()
+    if not text:
+        return []
+
+    vendor = backend()
+    if vendor == "sqlite":
+        query = _fts5_query(text)
+        if not query:
+            return []
+        weights = ", ".join(str(weight) for weight in SQLITE_WEIGHTS)
+        sql = (
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+            f"ORDER BY bm25({FTS_TABLE}, {weights}) LIMIT %s"
+        )
+        params = [query, limit]
+
+    elif vendor == "postgresql":
+        sql = (
+            "SELECT id FROM greenshan_project, websearch_to_tsquery('english', %s) query "
+            "WHERE search_vector @@ query "
+            "ORDER BY ts_rank_cd(search_vector, query) DESC LIMIT %s"
+        )
+        params = [text, limit]
+
+    else:
+        condition = Q()
+        for field in SEARCH_FIELDS:
+            condition |= Q(**{f"{field}__icontains": text})
+        return list(Project.objects.filter(condition).values_list("pk", flat=True)[:limit])
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def search_projects(text, limit=50, queryset=None):
+    """
+    Ranked Project instances for ``text``.
+    """
+    ids = search_ids(text, limit)
+    queryset = queryset if queryset is not None else Project.objects.all()
+    found = queryset.in_bulk(ids)
+    return [found[pk] for pk in ids if pk in found]
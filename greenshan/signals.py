@@ -0,0 +1,200 @@
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import (
+    post_init,
+    pre_save,
+    post_save,
+    pre_delete,
+    post_delete,
+)
+from django.dispatch import receiver
+
+from . import caching, notifications, search, sqlite, stats, timing
+from .images import variant_paths
+from .jobs import enqueue
+from .models import (
+    Project,
+    ProjectMedia,
+    Service,
+    Testimonial,
+    ContactRequest,
+)
+from .tasks import VARIANT_FIELDS
+
+
+# =================================================
+# POST-UPLOAD MEDIA PROCESSING
+# =================================================
+# Nothing here touches file contents: handlers only decide what changed
+# and hand the heavy work to the job queue (see tasks.py).
+
+def _fields(instance):
+    return VARIANT_FIELDS[instance._meta.label_lower]
+
+
+@receiver(pre_save, sender=Project)
+@receiver(pre_save, sender=ProjectMedia)
+def remember_replaced_file(sender, instance, raw=False, **kwargs):
+    if raw or not instance.pk:
+        return
+    file_field, _ = _fields(instance)
+    previous = (
+        sender.objects.filter(pk=instance.pk)
+        .values_list(file_field, flat=True)
+        .first()
+    )
+    current = getattr(instance, file_field).name
+    instance._replaced_file = previous if previous and previous != current else None
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=ProjectMedia)
+def schedule_media_processing(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    file_field, manifest_field = _fields(instance)
+    fieldfile = getattr(instance, file_field)
+    wanted = fieldfile.name if fieldfile and getattr(instance, "is_image", True) else None
+
+    if getattr(instance, manifest_field).get("source") != wanted:
+        enqueue("images.variants", model=instance._meta.label_lower, pk=instance.pk)
+
+    replaced = getattr(instance, "_replaced_file", None)
+    if replaced:
+        enqueue("files.delete", paths=[replaced])
+        instance._replaced_file = None
+
+
+@receiver(pre_delete, sender=Project)
+@receiver(pre_delete, sender=ProjectMedia)
+def schedule_file_cleanup(sender, instance, **kwargs):
+    """
+    Read the manifest from the database: the instance being deleted may
+    predate the job that filled it in. Runs only if the delete commits.
+    """
+    file_field, manifest_field = _fields(instance)
+    row = (
+        sender.objects.filter(pk=instance.pk)
+        .values(file_field, manifest_field)
+        .first()
+    )
+    if row is None:
+        return
+
+    paths = variant_paths(row[manifest_field])
+    if row[file_field]:
+        paths.add(row[file_field])
+    if paths:
+        enqueue("files.delete", paths=sorted(paths))
+
+
+# =================================================
+# PUBLIC PAGE CACHE INVALIDATION
+# =================================================
+
+CONTENT_GROUPS = {
+    Project: caching.PROJECTS,
+    ProjectMedia: caching.PROJECTS,
+    Service: caching.SERVICES,
+    Testimonial: caching.TESTIMONIALS,
+}
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=ProjectMedia)
+@receiver(post_save, sender=Service)
+@receiver(post_save, sender=Testimonial)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=ProjectMedia)
+@receiver(post_delete, sender=Service)
+@receiver(post_delete, sender=Testimonial)
+def invalidate_public_pages(sender, **kwargs):
+    # After commit, or a concurrent request could re-cache the old rows.
+    group = CONTENT_GROUPS[sender]
+    transaction.on_commit(lambda: caching.invalidate(group))
+
+
+# =================================================
+# DASHBOARD COUNTERS
+# =================================================
+# Deltas are computed against the flags the row had when it was loaded,
+# so toggling ``featured``/``visible``/``handled`` costs no extra query.
+
+COUNTED_MODELS = (Project, ProjectMedia, Testimonial, ContactRequest)
+
+
+def remember_counter_state(sender, instance, **kwargs):
+    # Always recorded (a few attribute reads) so a row loaded before the
+    # setting flipped still yields a correct delta.
+    instance._counter_state = stats.memberships(instance) if instance.pk else set()
+
+
+def update_counters_on_save(sender, instance, created, raw=False, **kwargs):
+    before = set() if created else getattr(instance, "_counter_state", set())
+    after = stats.memberships(instance)
+    instance._counter_state = after
+    if not raw and stats.counters_enabled():
+        stats.apply_deltas(after - before, before - after)
+
+
+def update_counters_on_delete(sender, instance, **kwargs):
+    if not stats.counters_enabled():
+        return
+    before = getattr(instance, "_counter_state", None)
+    if before is None:
+        before = stats.memberships(instance)
+    stats.apply_deltas(set(), before)
+
+
+for _model in COUNTED_MODELS:
+    post_init.connect(remember_counter_state, sender=_model)
+    post_save.connect(update_counters_on_save, sender=_model)
+    post_delete.connect(update_counters_on_delete, sender=_model)
+
+
+# =================================================
+# FULL-TEXT SEARCH INDEX
+# =================================================
+
+@receiver(post_save, sender=Project)
+def index_project(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not set(update_fields) & set(search.SEARCH_FIELDS):
+        return
+    search.index_project(instance)
+
+
+@receiver(post_delete, sender=Project)
+def unindex_project(sender, instance, **kwargs):
+    search.remove_project(instance.pk)
+
+
+# =================================================
+# STAFF NOTIFICATIONS
+# =================================================
+# One outbox row per event, inside the request's transaction; delivery
+# happens later in digest jobs (greenshan/notifications.py).
+
+@receiver(post_save, sender=ContactRequest)
+def notify_contact_request(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        notifications.record([notifications.contact_notification(instance)])
+
+
+@receiver(post_save, sender=ProjectMedia)
+def notify_upload(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        notifications.record([notifications.upload_notification(instance)])
+
+
+# =================================================
+# SQLITE PRODUCTION MODE
+# =================================================
+
+connection_created.connect(sqlite.configure_connection)
+
+
+# =================================================
+# REQUEST TIMING
+# =================================================
+
+connection_created.connect(timing.install_query_timer)
@@ -0,0 +1,191 @@
+import struct
+
+# =================================================
+# HEADER SNIFFING
+# =================================================
+# Identify an upload from its first bytes, and read image dimensions
+# from the header, without decoding anything. Cost is bounded by
+# MAX_HEADER_BYTES whatever the size of the file.
+
+SNIFF_BYTES = 64 * 1024
+MAX_HEADER_BYTES = 1024 * 1024  # JPEG EXIF/ICC segments can precede SOF
+
+# Sniffed format -> extensions a file with that content may carry.
+FORMAT_EXTENSIONS = {
+    "jpeg": {"jpg", "jpeg"},
+    "png": {"png"},
+    "gif": {"gif"},
+    "webp": {"webp"},
+    "mp4": {"mp4", "m4a", "mov"},
+    "mov": {"mov", "mp4"},
+    "m4a": {"m4a", "mp4"},
+    "webm": {"webm"},
+    "ogg": {"ogg"},
+    "mp3": {"mp3"},
+    "wav": {"wav"},
+    "pdf": {"pdf"},
+    "ole": {"doc", "ppt"},
+    "ooxml": {"docx", "pptx"},
+    "text": {"txt"},
+}
+
+IMAGE_FORMATS = {"jpeg", "png", "gif", "webp"}
+
+QUICKTIME_ATOMS = (b"moov", b"mdat", b"wide", b"free", b"skip", b"pnot")
+
+# JPEG start-of-frame markers (not DHT C4, JPG C8 or DAC CC).
+JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+JPEG_STANDALONE = {0x01, 0xD8} | set(range(0xD0, 0xD8))
+
+
+class HeaderReader:
+    """
+    Random access to the start of a file, fetched lazily. Starts from
+    bytes already captured while the upload streamed in, if any, and
+    never reads past MAX_HEADER_BYTES.
+    """
+
+    def __init__(self, file, prefix=b""):
+        self.file = file
+        self.buffer = bytearray(prefix)
+        self.exhausted = False
+
+    def ensure(self, end):
+        end = min(end, MAX_HEADER_BYTES)
+        if len(self.buffer) >= end or self.exhausted:
+            return len(self.buffer) >= end
+
+        position = self.file.tell()
+        self.file.seek(len(self.buffer))
+        while len(self.buffer) < end:
+            data = self.file.read(max(end - len(self.buffer), SNIFF_BYTES))
+            if not data:
+                self.exhausted = True
+                break
+            self.buffer += data
+        self.file.seek(position)
+        return len(self.buffer) >= end
+
+    def read(self, offset, length):
+        if not self.ensure(offset + length):
+            return None
+        return bytes(self.buffer[offset:offset + length])
+
+    @property
+    def head(self):
+        self.ensure(SNIFF_BYTES)
+        return bytes(self.buffer[:SNIFF_BYTES])
+
+
+def _is_text(header):
+    if b"\x00" in header:
+        return False
+    try:
+        header.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        # A multibyte character cut off by the sniff window is fine.
+        return exc.start >= len(header) - 3 and exc.reason == "unexpected end of data"
+    return True
+
+
+def sniff(header):
+    """
+    Return the content format of ``header`` (a key of FORMAT_EXTENSIONS)
+    or None when it is not one we accept.
+    """
+    if header.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if header[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if header[:4] == b"RIFF":
+        return {b"WEBP": "webp", b"WAVE": "wav"}.get(header[8:12])
+    if header[4:8] == b"ftyp":
+        brand = header[8:12]
+        if brand in (b"M4A ", b"M4B "):
+            return "m4a"
+        if brand == b"qt  ":
+            return "mov"
+        if brand in (b"avif", b"avis", b"heic", b"heix", b"mif1", b"msf1"):
+            return None
+        return "mp4"
+    if header[4:8] in QUICKTIME_ATOMS:
+        return "mov"
+    if header[:4] == b"\x1aE\xdf\xa3":
+        return "webm" if b"webm" in header[:64] else None
+    if header[:4] == b"OggS":
+        return "ogg"
+    if header[:3] == b"ID3" or (len(header) > 1 and header[0] == 0xFF and header[1] & 0xE0 == 0xE0):
+        return "mp3"
+    if header[:5] == b"%PDF-":
+        return "pdf"
+    if header[:8] == b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1":
+        return "ole"
+    if header[:4] == b"PK\x03\x04":
+        return "ooxml" if b"[Content_Types].xml" in header else None
+    if _is_text(header):
+        return "text"
+    return None
+
+
+# =================================================
+# IMAGE DIMENSIONS FROM HEADERS
+# =================================================
+
+def _jpeg_size(reader):
+    offset = 2
+    while True:
+        marker = reader.read(offset, 2)
+        if marker is None or marker[0] != 0xFF:
+            return None
+        if marker[1] == 0xFF:
+            offset += 1  # fill byte
+            continue
+        if marker[1] in JPEG_STANDALONE:
+            offset += 2
+            continue
+
+        segment = reader.read(offset + 2, 7)
+        if segment is None:
+            return None
+        if marker[1] in JPEG_SOF:
+            height, width = struct.unpack(">HH", segment[3:7])
+            return width, height
+        offset += 2 + struct.unpack(">H", segment[:2])[0]
+
+
+def _webp_size(reader):
+    chunk = reader.read(12, 18)
+    if chunk is None:
+        return None
+    kind = chunk[:4]
+    if kind == b"VP8 ":
+        width, height = struct.unpack("<HH", chunk[14:18])
+        return width & 0x3FFF, height & 0x3FFF
+    if kind == b"VP8L":
+        bits = int.from_bytes(chunk[9:13], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if kind == b"VP8X":
+        return (
+            int.from_bytes(chunk[12:15], "little") + 1,
+            int.from_bytes(chunk[15:18], "little") + 1,
+        )
+    return None
+
+
+def image_size(reader, fmt):
+    """
+    (width, height) read from the header of a sniffed image, or None.
+    """
+    if fmt == "png":
+        ihdr = reader.read(16, 8)
+        return struct.unpack(">II", ihdr) if ihdr else None
+    if fmt == "gif":
+        screen = reader.read(6, 4)
+        return struct.unpack("<HH", screen) if screen else None
+    if fmt == "webp":
+        return _webp_size(reader)
+    if fmt == "jpeg":
+        return _jpeg_size(reader)
+    return None
@@ -0,0 +1,233 @@
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import notifications, stats
+from .models import ContactRequest
+
+logger = logging.getLogger(__name__)
+
+# =================================================
+# CONTACT WRITE-BEHIND SPOOL
+# =================================================
+# With CONTACT_WRITE_BEHIND on, ContactView appends each accepted
+# submission to an append-only file and answers at once; the flusher
+# (run_jobs, or `manage.py flush_contact_spool`) bulk-inserts them.
+#
+# Guarantees:
+#   * No loss after acknowledgement. A record is written and fsynced
+#     before the view returns; the visitor is only told "sent" after it
+#     is on disk. A crash mid-write leaves a torn last line, which was
+#     never acknowledged and is dropped on replay.
+#   * Crash recovery. Spool files are only deleted after their rows are
+#     committed. Anything left over (live segments, sealed batches from
+#     an interrupted flush) is picked up by the next flush.
+#   * No duplicates. Every record carries a UUID stored in
+#     ContactRequest.spool_id; replaying a batch skips rows already in.
+#   * Per host. The spool lives on local disk (CONTACT_SPOOL_DIR): run
+#     a flusher on every host that serves the contact form.
+#
+# Each worker process appends to its own segment, so workers never wait
+# on each other, only (briefly) on the flusher sealing their segment.
+# Segment names carry a per-process token as well as the PID: a worker
+# that reuses a dead one's PID must not append after its torn line.
+
+SEGMENT_GLOB = "contact-*.jsonl"
+BATCH_GLOB = "contact-*.batch"
+FLUSH_LOCK = ".flush.lock"
+
+_lock = threading.Lock()   # threads of one worker share its segment
+_segment = None            # (pid, file name) of this process's segment
+
+RECORD_FIELDS = ("name", "email", "subject", "message")
+
+
+def enabled():
+    return getattr(settings, "CONTACT_WRITE_BEHIND", False)
+
+
+def spool_dir():
+    return Path(settings.CONTACT_SPOOL_DIR)
+
+
+def segment_path():
+    global _segment
+    pid = os.getpid()
+    # Checked against the PID so a forked worker gets its own name.
+    if _segment is None or _segment[0] != pid:
+        _segment = (pid, f"contact-{pid}-{uuid.uuid4().hex[:12]}.jsonl")
+    return spool_dir() / _segment[1]
+
+
+def _inode(path):
+    try:
+        return os.stat(path).st_ino
+    except FileNotFoundError:
+        return None
+
+
+def _fsync_dir(directory):
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+# ---------------------------------------------
+# Writing (request path)
+# ---------------------------------------------
+
+def append(fields):
+    """
+    Durably spool one submission; returns its spool id.
+    """
+    record = {
+        "id": uuid.uuid4().hex,
+        "created": timezone.now().isoformat(),
+        **{name: fields[name] for name in RECORD_FIELDS},
+    }
+    line = (json.dumps(record, separators=(",", ":")) + "\n").encode()
+
+    directory = spool_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    path = segment_path()
+
+    with _lock:
+        while True:
+            fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                # The flusher may have sealed (renamed) this file while we
+                # waited for the lock: start a fresh segment instead.
+                if os.fstat(fd).st_ino != _inode(path):
+                    continue
+                size = os.fstat(fd).st_size
+                new_segment = size == 0
+                # An earlier write failed part-way: end its torn line so
+                # this record stays on a line of its own.
+                torn = not new_segment and os.pread(fd, 1, size - 1) != b"\n"
+                view = memoryview(b"\n" + line if torn else line)
+                while view:
+                    view = view[os.write(fd, view):]
+                os.fsync(fd)
+                if new_segment:
+                    _fsync_dir(directory)
+                return record["id"]
+            finally:
+                os.close(fd)
+
+
+# ---------------------------------------------
+# Flushing (background)
+# ---------------------------------------------
+
+@contextmanager
+def _exclusive(directory):
+    """
+    One flusher per spool directory; others return immediately.
+    """
+    fd = os.open(directory / FLUSH_LOCK, os.O_WRONLY | os.O_CREAT, 0o600)
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        yield True
+    finally:
+        os.close(fd)
+
+
+def seal(path):
+    """
+    Rename a live segment to an immutable batch. Holding the segment's
+    lock means no append is half-done; appends that were waiting notice
+    the rename and open a new segment.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        if os.fstat(fd).st_ino != _inode(path):
+            return
+        os.rename(path, path.with_name(f"{path.stem}-{time.time_ns()}.batch"))
+    finally:
+        os.close(fd)
+
+
+def read_batch(path):
+    records = []
+    with open(path, "rb") as fh:
+        for line in fh:
+            if not line.endswith(b"\n"):
+                # Torn final write: the visitor was never acknowledged.
+                break
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                logger.warning("Skipping unreadable line in %s: %r", path.name, line[:200])
+    return records
+
+
+def _insert(records):
+    """
+    Insert the records not already present; returns how many were new.
+    """
+    ids = [uuid.UUID(record["id"]) for record in records]
+    with transaction.atomic():
+        present = set(
+            ContactRequest.objects.filter(spool_id__in=ids).values_list("spool_id", flat=True)
+        )
+        rows = [
+            ContactRequest(
+                spool_id=spool_id,
+                created=parse_datetime(record["created"]),
+                **{name: record[name] for name in RECORD_FIELDS},
+            )
+            for spool_id, record in zip(ids, records)
+            if spool_id not in present
+        ]
+        ContactRequest.objects.bulk_create(rows)
+        # bulk_create bypasses the counter and notification signals.
+        stats.adjust("messages_pending", len(rows))
+        notifications.record(notifications.contact_notification(row) for row in rows)
+    return len(rows)
+
+
+def flush(batch_size=None):
+    """
+    Seal every live segment and load every batch; returns rows inserted.
+    """
+    directory = spool_dir()
+    if not directory.is_dir():
+        return 0
+    batch_size = batch_size or getattr(settings, "CONTACT_SPOOL_BATCH_SIZE", 500)
+
+    written = 0
+    with _exclusive(directory) as acquired:
+        if not acquired:
+            return 0
+
+        for path in directory.glob(SEGMENT_GLOB):
+            seal(path)
+
+        for path in sorted(directory.glob(BATCH_GLOB)):
+            records = read_batch(path)
+            for start in range(0, len(records), batch_size):
+                written += _insert(records[start:start + batch_size])
+            # Only now can the file go: every row in it is committed.
+            path.unlink()
+
+    return written
+
@@ -0,0 +1,40 @@
+from django.conf import settings
+
+# =================================================
+# SQLITE PRODUCTION MODE
+# =================================================
+# For small installs running db.sqlite3 under several gunicorn workers.
+# Applied to every new connection when SQLITE_PRODUCTION_MODE is on;
+# writers additionally use BEGIN IMMEDIATE (see greenshan_project/database.py).
+
+PRAGMAS = (
+    # Readers see the last committed snapshot while a writer works:
+    # reads never wait for writes, and writes never wait for reads.
+    ("journal_mode", "wal"),
+    # Durable at each WAL checkpoint instead of each commit; still
+    # corruption-safe in WAL mode.
+    ("synchronous", "normal"),
+    # Queue for the write lock instead of failing with "database is locked".
+    ("busy_timeout", 5000),
+    # Read through a 256 MB memory map instead of read() syscalls.
+    ("mmap_size", 256 * 1024 * 1024),
+    # 64 MB page cache (negative = KiB).
+    ("cache_size", -64 * 1024),
+    ("temp_store", "memory"),
+    ("foreign_keys", "on"),
+)
+
+
+def production_mode():
+    return getattr(settings, "SQLITE_PRODUCTION_MODE", False)
+
+
+def apply_pragmas(connection):
+    with connection.cursor() as cursor:
+        for name, value in PRAGMAS:
+            cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def configure_connection(sender, connection, **kwargs):
+    if connection.vendor == "sqlite" and production_mode():
+        apply_pragmas(connection)
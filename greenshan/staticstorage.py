@@ -0,0 +1,140 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+from .hashing import hash_stream
+from .images import generate_variants, variant_paths
+
+# =================================================
+# BUILD-TIME STATIC IMAGE DERIVATIVES
+# =================================================
+# During collectstatic, every raster image under STATICFILES_DIRS gets
+# resized AVIF/WebP/original-format derivatives (images.generate_variants,
+# encoded in parallel across cores). They then go through the normal
+# manifest pipeline, so they get hashed names and far-future caching
+# like any other static file. {% static_picture %} renders them.
+
+STATIC_IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+# Smaller steps than uploads: logos and icons render at tens of pixels.
+STATIC_IMAGE_WIDTHS = (120, 240, 480, 960, 1440, 1920)
+
+IMAGE_MANIFEST_NAME = "static-images.json"
+
+
+class StaticSource:
+    """
+    The bits of a FieldFile that generate_variants/ResponsiveImage use.
+    """
+
+    def __init__(self, storage, name):
+        self.storage = storage
+        self.name = name
+
+    def __bool__(self):
+        return bool(self.name)
+
+    @property
+    def url(self):
+        return self.storage.url(self.name)
+
+
+def _build(location, name):
+    """
+    Worker process entry point: encode one image's derivatives in place.
+    """
+    if not apps.ready:
+        django.setup()
+    return generate_variants(
+        StaticSource(FileSystemStorage(location=location), name),
+        widths=STATIC_IMAGE_WIDTHS,
+    )
+
+
+class OptimizedStaticFilesStorage(CompressedManifestStaticFilesStorage):
+
+    def stored_name(self, name):
+        # Before the first collectstatic (development, tests) there is no
+        # manifest: serve plain names instead of failing every {% static %}.
+        # Strict mode (WHITENOISE_MANIFEST_STRICT) raises like Django does.
+        if not self.hashed_files and not self.manifest_strict:
+            return name
+        return super().stored_name(name)
+
+    # ---------------------------------------------
+    # Image manifest (source -> variant manifest)
+    # ---------------------------------------------
+
+    def read_image_manifest(self):
+        try:
+            with self.open(IMAGE_MANIFEST_NAME) as fh:
+                return json.loads(fh.read().decode())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    @property
+    def image_variants(self):
+        if not hasattr(self, "_image_variants"):
+            self._image_variants = {
+                name: entry["manifest"]
+                for name, entry in self.read_image_manifest().items()
+            }
+        return self._image_variants
+
+    # ---------------------------------------------
+    # collectstatic
+    # ---------------------------------------------
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            paths = dict(paths)
+            paths.update(self.build_image_variants(paths))
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+
+    def build_image_variants(self, paths):
+        """
+        Derivatives for every image in ``paths``, reusing last run's
+        output when the source digest is unchanged. Returns the extra
+        {name: (storage, name)} entries for the manifest pipeline.
+        """
+        previous = self.read_image_manifest()
+        entries, pending = {}, {}
+
+        for name in sorted(paths):
+            if not name.lower().endswith(STATIC_IMAGE_EXTENSIONS):
+                continue
+            with self.open(name) as fh:
+                digest = hash_stream(fh.chunks())
+
+            entry = previous.get(name)
+            if (
+                entry
+                and entry["digest"] == digest
+                and all(self.exists(path) for path in variant_paths(entry["manifest"]))
+            ):
+                entries[name] = entry
+            else:
+                pending[name] = digest
+
+        if pending:
+            with ProcessPoolExecutor() as pool:
+                built = pool.map(_build, [self.location] * len(pending), list(pending))
+                for (name, digest), manifest in zip(pending.items(), built):
+                    entries[name] = {"digest": digest, "manifest": manifest}
+
+        if self.exists(IMAGE_MANIFEST_NAME):
+            self.delete(IMAGE_MANIFEST_NAME)
+        self.save(IMAGE_MANIFEST_NAME, ContentFile(json.dumps(entries, indent=1).encode()))
+        self._image_variants = {name: entry["manifest"] for name, entry in entries.items()}
+
+        return {
+            path: (self, path)
+            for entry in entries.values()
+            for path in variant_paths(entry["manifest"])
+        }
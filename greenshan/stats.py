@@ -0,0 +1,138 @@
+from django.conf import settings
+from django.db import connections, router
+from django.db.models import Case, F, Func, Q, When
+
+from .models import (
+    Project,
+    ProjectMedia,
+    Testimonial,
+    ContactRequest,
+    DashboardCounter,
+)
+
+# =================================================
+# DASHBOARD COUNTERS
+# =================================================
+# name -> (model, field conditions). The same definition drives the
+# live SQL, the signal-maintained counters and their reconciliation.
+
+COUNTERS = {
+    "projects_total": (Project, {}),
+    "featured_projects": (Project, {"featured": True}),
+    "media_count": (ProjectMedia, {}),
+    "testimonials_total": (Testimonial, {}),
+    "testimonials_visible": (Testimonial, {"visible": True}),
+    "messages_pending": (ContactRequest, {"handled": False}),
+}
+
+
+def counters_enabled():
+    return getattr(settings, "DASHBOARD_COUNTERS", False)
+
+
+def _count_if(conditions):
+    # A plain Func (not an Aggregate) so Django adds no GROUP BY.
+    if not conditions:
+        return Func(F("pk"), function="COUNT")
+    return Func(Case(When(Q(**conditions), then=1)), function="COUNT")
+
+
+def live_stats():
+    """
+    Every dashboard count in one round trip: one conditional-aggregate
+    derived table per model, cross-joined into a single row. Only if the
+    router sends the models to different databases is there one round
+    trip per database.
+    """
+    by_alias = {}
+    for name, (model, conditions) in COUNTERS.items():
+        by_model = by_alias.setdefault(router.db_for_read(model), {})
+        by_model.setdefault(model, {})[name] = _count_if(conditions)
+
+    result = {}
+    for alias, by_model in by_alias.items():
+        result.update(_cross_join(alias, by_model))
+    return {name: result[name] for name in COUNTERS}
+
+
+def _cross_join(alias, by_model):
+    connection = connections[alias]
+    parts, params, names = [], [], []
+    for index, (model, annotations) in enumerate(by_model.items()):
+        sql, part_params = (
+            model.objects.using(alias).order_by()
+            .annotate(**annotations)
+            .values(*annotations)
+            .query.get_compiler(alias).as_sql()
+        )
+        parts.append(f"({sql}) {connection.ops.quote_name(f's{index}')}")
+        params.extend(part_params)
+        names.extend(annotations)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT * FROM {' CROSS JOIN '.join(parts)}", params)
+        row = cursor.fetchone()
+
+    return dict(zip(names, row))
+
+
+def counter_stats():
+    """
+    O(1) read of the signal-maintained counters; falls back to a
+    reconciliation if any counter row is missing.
+    """
+    stats = dict(DashboardCounter.objects.values_list("name", "value"))
+    if set(stats) != set(COUNTERS):
+        stats = reconcile()
+    return stats
+
+
+def dashboard_stats():
+    return counter_stats() if counters_enabled() else live_stats()
+
+
+def reconcile():
+    """
+    Overwrite the counters with true values (signals miss bulk update()
+    and delete() calls that bypass model instances).
+    """
+    stats = live_stats()
+    DashboardCounter.objects.bulk_create(
+        [DashboardCounter(name=name, value=value) for name, value in stats.items()],
+        update_conflicts=True,
+        unique_fields=["name"],
+        update_fields=["value"],
+    )
+    return stats
+
+
+# =================================================
+# INCREMENTAL MAINTENANCE
+# =================================================
+
+def memberships(instance):
+    """
+    Names of the counters ``instance`` currently contributes to.
+    """
+    return {
+        name
+        for name, (model, conditions) in COUNTERS.items()
+        if isinstance(instance, model)
+        and all(getattr(instance, field) == value for field, value in conditions.items())
+    }
+
+
+def adjust(name, delta):
+    """
+    Counter correction for bulk update()/delete() paths that bypass
+    model signals.
+    """
+    if delta and counters_enabled():
+        DashboardCounter.objects.filter(name=name).update(value=F("value") + delta)
+
+
+def apply_deltas(added, removed):
+    if added:
+        DashboardCounter.objects.filter(name__in=added).update(value=F("value") + 1)
+    if removed:
+        DashboardCounter.objects.filter(name__in=removed).update(value=F("value") - 1)
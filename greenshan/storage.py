@@ -0,0 +1,232 @@
+import fcntl
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadhandler import (
+    MemoryFileUploadHandler,
+    TemporaryFileUploadHandler,
+)
+
+from .hashing import BlockHasher
+from .sniffing import SNIFF_BYTES
+from .timing import TimedStorageMixin
+
+# =================================================
+# CONTENT-ADDRESSED MEDIA STORAGE
+# =================================================
+# Uploads are stored by the digest of their bytes (hashing.py):
+#
+#     cas/3f/a2/3fa2...e9.jpg
+#
+# Identical uploads map to the same name, so the second copy costs no
+# write at all and every project shares one browser-cacheable URL. The
+# bytes behind a name never change, which makes the URL immutable.
+# Derivatives (images.variant_name) sit next to their source and are
+# saved under the exact name asked for.
+#
+# Files are shared, so nothing may delete one while a row still points
+# at it: see tasks.referenced(). A duplicate upload reuses a file before
+# its row commits, so reuse and deletion both take content_lock(), and
+# reuse leaves a claim that keeps the file alive for CAS_REUSE_GRACE
+# seconds (tasks.delete_unreferenced retries after it).
+
+CAS_PREFIX = "cas"
+
+
+def content_name(digest, filename):
+    ext = os.path.splitext(filename)[1].lower()
+    return f"{CAS_PREFIX}/{digest[:2]}/{digest[2:4]}/{digest}{ext}"
+
+
+def is_content_addressed(name):
+    return name.startswith(f"{CAS_PREFIX}/")
+
+
+def content_root(name):
+    """
+    ``cas/3f/a2/3fa2...e9`` for a source or any of its derivatives.
+    """
+    directory, filename = os.path.split(name)
+    return f"{directory}/{filename.split('.', 1)[0]}"
+
+
+def work_dir():
+    """
+    Locks, reuse claims and temp files, outside MEDIA_ROOT (never
+    served). Keep it on the same filesystem so publishing is a rename.
+    """
+    return getattr(settings, "CAS_WORK_DIR", os.path.join(settings.BASE_DIR, ".cas"))
+
+
+def _work_path(*parts):
+    path = os.path.join(work_dir(), *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+@contextmanager
+def content_lock(name):
+    """
+    Exclusive lock, across processes on this host, on the content
+    ``name`` (a source or a derivative) belongs to. Locks are striped
+    over 256 files by digest prefix. Other names are unique per row and
+    need no lock.
+    """
+    if not is_content_addressed(name):
+        yield
+        return
+
+    digest = os.path.basename(content_root(name))
+    with open(_work_path("locks", f"{digest[:2]}.lock"), "a") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _claim_path(name):
+    digest = os.path.basename(content_root(name))
+    return _work_path("claims", digest[:2], digest)
+
+
+def claim(name):
+    """
+    Record that a duplicate upload is about to point a row at ``name``.
+    Call under content_lock().
+    """
+    path = _claim_path(name)
+    with open(path, "a"):
+        os.utime(path)
+
+
+def recently_claimed(name, grace):
+    try:
+        return time.time() - os.path.getmtime(_claim_path(name)) < grace
+    except FileNotFoundError:
+        return False
+
+
+def release(name):
+    try:
+        os.remove(_claim_path(name))
+    except FileNotFoundError:
+        pass
+
+
+class ContentAddressedStorage(TimedStorageMixin, FileSystemStorage):
+
+    def get_available_name(self, name, max_length=None):
+        # Content names are final; only derivatives can collide, and
+        # images.generate_variants deletes the old one first.
+        if is_content_addressed(name):
+            return super().get_available_name(name, max_length)
+        return name
+
+    def _save(self, name, content):
+        if is_content_addressed(name):
+            return super()._save(name, content)
+
+        digest = getattr(content, "content_digest", None)
+        if digest is not None:
+            # Hashed while it streamed in: a duplicate is a pure no-op.
+            final = content_name(digest, name)
+            if self._reuse(final):
+                return final
+            if hasattr(content, "temporary_file_path"):
+                return self._publish(content.temporary_file_path(), final)
+
+        tmp_path, digest = self._spool(content)
+        try:
+            return self._publish(tmp_path, content_name(digest, name))
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _spool(self, content):
+        """
+        Copy ``content`` to a temp file in CAS_WORK_DIR, hashing each
+        chunk on the way through: one read, one write, nothing buffered.
+        Half-written files there are never reachable through /media/.
+        """
+        directory = os.path.join(work_dir(), "tmp")
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+
+        hasher = BlockHasher()
+        with os.fdopen(fd, "wb") as fh:
+            for chunk in content.chunks():
+                hasher.update(chunk)
+                fh.write(chunk)
+        return tmp_path, hasher.hexdigest()
+
+    def _reuse(self, final):
+        with content_lock(final):
+            if not os.path.exists(self.path(final)):
+                return False
+            claim(final)
+            return True
+
+    def _publish(self, source, final):
+        full_path = self.path(final)
+        with content_lock(final):
+            if os.path.exists(full_path):
+                claim(final)
+                return final
+
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            try:
+                file_move_safe(source, full_path, allow_overwrite=False)
+            except FileExistsError:
+                # An identical upload on another host finished first.
+                claim(final)
+                return final
+
+        if self.file_permissions_mode is not None:
+            os.chmod(full_path, self.file_permissions_mode)
+        return final
+
+
+# =================================================
+# HASH-WHILE-UPLOADING HANDLERS
+# =================================================
+# Django's own handlers, plus a digest of the bytes they keep and a
+# copy of the first SNIFF_BYTES. The storage above never re-reads an
+# upload to name it, and content validation (models.
+# validate_file_content) never re-reads it to sniff the type.
+
+class HashingUploadMixin:
+
+    def new_file(self, *args, **kwargs):
+        self.hasher = BlockHasher()
+        self.header = bytearray()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        passed_on = super().receive_data_chunk(raw_data, start)
+        if passed_on is None:
+            # This handler kept the chunk (the next one will not see it).
+            self.hasher.update(raw_data)
+            if len(self.header) < SNIFF_BYTES:
+                self.header += raw_data[:SNIFF_BYTES - len(self.header)]
+        return passed_on
+
+    def file_complete(self, file_size):
+        uploaded = super().file_complete(file_size)
+        if uploaded is not None:
+            uploaded.content_digest = self.hasher.hexdigest()
+            uploaded.header = bytes(self.header)
+        return uploaded
+
+
+class HashingMemoryFileUploadHandler(HashingUploadMixin, MemoryFileUploadHandler):
+    pass
+
+
+class HashingTemporaryFileUploadHandler(HashingUploadMixin, TemporaryFileUploadHandler):
+    pass
@@ -0,0 +1,185 @@
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+# =================================================
+# RANGE PARSING
+# =================================================
+
+def parse_range(header, size):
+    """
+    Parse a single-range ``Range`` header into an inclusive (start, end)
+    pair. Returns None to serve the whole file (absent, malformed or
+    multi-range headers) and raises ValueError when unsatisfiable.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if size == 0:
+        # No byte of an empty file can be selected.
+        raise ValueError("Empty file")
+
+    if not first:
+        # Suffix range: the final N bytes.
+        length = int(last)
+        if length == 0:
+            raise ValueError("Empty suffix range")
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError("Unsatisfiable range")
+    return start, min(end, size - 1)
+
+
+def if_range_matches(header, etag, last_modified):
+    """
+    ``If-Range`` is either an entity tag or an HTTP date. A mismatch
+    means the client's partial copy is stale: send the full file.
+    """
+    if not header:
+        return True
+    if header.startswith(('"', 'W/')):
+        return header == etag
+    return parse_http_date_safe(header) == int(last_modified)
+
+
+# =================================================
+# FILE DELIVERY
+# =================================================
+
+class RangeFile:
+    """
+    File wrapper that stops reading after ``length`` bytes. It keeps
+    ``fileno()`` so WSGI servers with a file_wrapper (gunicorn) can
+    still os.sendfile() the slice straight from the page cache.
+    """
+
+    def __init__(self, fh, length):
+        self.fh = fh
+        self.remaining = length
+        self.name = fh.name
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.fh.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.fh.fileno()
+
+    def close(self):
+        self.fh.close()
+
+
+def _sendfile_response(path, content_type):
+    """
+    Let the front-end server stream the bytes (and honour Range itself).
+    """
+    mode = getattr(settings, "MEDIA_SENDFILE", "")
+    response = HttpResponse(content_type=content_type)
+
+    if mode == "nginx":
+        relative = os.path.relpath(path, settings.MEDIA_ROOT).replace(os.sep, "/")
+        response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_PREFIX + relative
+    elif mode == "xsendfile":
+        response["X-Sendfile"] = path
+    else:
+        return None
+    return response
+
+
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+
+# mimetypes encodings -> the type of the compressed file itself.
+COMPRESSED_TYPES = {
+    "gzip": "application/gzip",
+    "bzip2": "application/x-bzip2",
+    "xz": "application/x-xz",
+    "br": "application/x-brotli",
+    "compress": "application/x-compress",
+}
+
+
+def serve_file(request, path, immutable=False):
+    """
+    Serve ``path`` with validators, conditional GET and byte ranges.
+    ``immutable`` files (content-addressed names) are cached for a year.
+    """
+    stat = os.stat(path)
+    size = stat.st_size
+    etag = quote_etag(f"{stat.st_mtime_ns:x}-{size:x}")
+    last_modified = stat.st_mtime
+
+    content_type, encoding = mimetypes.guess_type(path)
+    if encoding:
+        # reel.tar.gz is a gzip file to download, not a tar the browser
+        # should transparently decompress (and Range would then address
+        # the decoded bytes).
+        content_type = COMPRESSED_TYPES.get(encoding)
+    content_type = content_type or "application/octet-stream"
+
+    not_modified = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified),
+    )
+    if not_modified is not None:
+        response = not_modified
+    else:
+        response = _sendfile_response(path, content_type)
+
+    if response is None:
+        byte_range = None
+        if if_range_matches(request.headers.get("If-Range"), etag, last_modified):
+            try:
+                byte_range = parse_range(request.headers.get("Range"), size)
+            except ValueError:
+                response = HttpResponse(status=416)
+                response["Content-Range"] = f"bytes */{size}"
+                return response
+
+        fh = open(path, "rb")
+        if byte_range is None:
+            response = FileResponse(fh, content_type=content_type)
+            response["Content-Length"] = size
+        else:
+            start, end = byte_range
+            fh.seek(start)
+            response = FileResponse(
+                RangeFile(fh, end - start + 1),
+                content_type=content_type,
+                status=206,
+            )
+            response["Content-Length"] = end - start + 1
+            response["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    if immutable:
+        patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(
+            response,
+            public=True,
+            max_age=getattr(settings, "MEDIA_CACHE_MAX_AGE", 86400),
+        )
+    return response
@@ -0,0 +1,148 @@
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from django.utils import timezone
+from PIL import Image
+
+from . import caching
+from .images import generate_variants, variant_paths
+from .jobs import enqueue, task
+from .storage import (
+    content_lock,
+    content_root,
+    is_content_addressed,
+    recently_claimed,
+    release,
+)
+
+# Model label -> (file field, manifest field) for models with image derivatives.
+VARIANT_FIELDS = {
+    "greenshan.project": ("cover", "cover_variants"),
+    "greenshan.projectmedia": ("file", "variants"),
+}
+
+
+# =================================================
+# SHARED-FILE REFERENCE COUNTING
+# =================================================
+
+def referenced(paths):
+    """
+    The subset of ``paths`` some row still points at. Content-addressed
+    files (and their derivatives) can be shared by any number of covers
+    and media rows; the rows themselves are the reference count, so it
+    can never drift. Other uploads are unique per row.
+    """
+    roots = {content_root(path) for path in paths if is_content_addressed(path)}
+    if not roots:
+        return set()
+
+    live = set()
+    for label, (file_field, _) in VARIANT_FIELDS.items():
+        condition = Q()
+        for root in roots:
+            condition |= Q(**{f"{file_field}__startswith": f"{root}."})
+        names = apps.get_model(label).objects.filter(condition).values_list(file_field, flat=True)
+        live.update(content_root(name) for name in names)
+
+    return {
+        path for path in paths
+        if is_content_addressed(path) and content_root(path) in live
+    }
+
+
+def delete_unreferenced(storage, paths):
+    """
+    Delete the ``paths`` no row points at. The check is repeated under
+    the content lock right before each unlink, and content a duplicate
+    upload claimed within CAS_REUSE_GRACE is retried after it: that
+    upload's row may not have committed yet.
+    """
+    paths = set(paths)
+    grace = getattr(settings, "CAS_REUSE_GRACE", 60 * 60)
+    deferred = []
+    for path in sorted(paths - referenced(paths)):
+        with content_lock(path):
+            if referenced({path}):
+                continue
+            if is_content_addressed(path) and recently_claimed(path, grace):
+                deferred.append(path)
+                continue
+            storage.delete(path)
+            release(path)
+
+    if deferred:
+        enqueue("files.delete", delay=grace, paths=deferred)
+
+
+def shared_manifest(source):
+    """
+    Derivatives already built for the same content by another row.
+    """
+    if not source or not is_content_addressed(source):
+        return None
+    for label, (file_field, manifest_field) in VARIANT_FIELDS.items():
+        manifest = (
+            apps.get_model(label).objects
+            .filter(**{file_field: source, f"{manifest_field}__source": source})
+            .values_list(manifest_field, flat=True)
+            .first()
+        )
+        if manifest:
+            return manifest
+    return None
+
+
+# =================================================
+# IMAGE DERIVATIVES & METADATA
+# =================================================
+
+@task("images.variants")
+def build_variants(model, pk, reuse=True):
+    """
+    Decode the upload once, record its dimensions/format and write
+    every derivative. Safe to re-run: exits early if already current.
+    A deduplicated upload reuses the derivatives of its first copy.
+    """
+    Model = apps.get_model(model)
+    file_field, manifest_field = VARIANT_FIELDS[model]
+
+    instance = Model.objects.filter(pk=pk).first()
+    if instance is None:
+        return
+
+    fieldfile = getattr(instance, file_field)
+    old = getattr(instance, manifest_field)
+    # ProjectMedia only gets derivatives for images; covers always do.
+    source = fieldfile.name if fieldfile and getattr(instance, "is_image", True) else None
+    if old.get("source") == source:
+        return
+
+    manifest = (reuse and shared_manifest(source)) or {}
+    if source and not manifest:
+        try:
+            manifest = generate_variants(fieldfile)
+        except (OSError, ValueError, Image.DecompressionBombError):
+            # Undecodable upload: remember it so we don't retry every save.
+            manifest = {"source": source, "variants": {}}
+
+    # Only publish if the file wasn't replaced again while we worked.
+    # update() skips auto_now; bump ``updated`` so fragment keys change with srcsets.
+    updated = Model.objects.filter(pk=pk, **{file_field: fieldfile.name or ""}).update(
+        **{manifest_field: manifest, "updated": timezone.now()}
+    )
+    if updated:
+        caching.invalidate(caching.PROJECTS)
+        delete_unreferenced(fieldfile.storage, variant_paths(old) - variant_paths(manifest))
+    else:
+        delete_unreferenced(fieldfile.storage, variant_paths(manifest) - variant_paths(old))
+
+
+# =================================================
+# FILE CLEANUP
+# =================================================
+
+@task("files.delete")
+def delete_files(paths):
+    delete_unreferenced(default_storage, paths)
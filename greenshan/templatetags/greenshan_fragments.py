@@ -0,0 +1,24 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from greenshan.caching import render_fragments
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def cached_cards(context, objects, template_name, as_name="project"):
+    """
+    Render ``template_name`` once per object, with the object bound to
+    ``as_name``, through the fragment cache (greenshan.caching). Card
+    templates must only depend on the object, never on the request.
+
+        {% cached_cards projects "greenshan/partials/project_card.html" %}
+    """
+    card = context.template.engine.get_template(template_name)
+
+    def render(obj):
+        with context.push(**{as_name: obj}):
+            return card.render(context)
+
+    return mark_safe(render_fragments(template_name, objects, render))
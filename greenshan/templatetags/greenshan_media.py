@@ -0,0 +1,35 @@
+from django import template
+from django.contrib.staticfiles.storage import staticfiles_storage
+
+from greenshan.images import ResponsiveImage
+from greenshan.staticstorage import StaticSource
+
+register = template.Library()
+
+
+@register.simple_tag
+def picture(image, sizes="100vw", **attrs):
+    """
+    Responsive <picture> for a ResponsiveImage (project.cover_image,
+    media.image). Extra keyword arguments become <img> attributes;
+    underscores are turned into hyphens (data_lightbox -> data-lightbox).
+
+        {% picture project.cover_image sizes="(min-width: 900px) 33vw, 100vw" alt=project.title loading="lazy" %}
+    """
+    if not image:
+        return ""
+    return image.render(sizes=sizes, **attrs)
+
+
+@register.simple_tag
+def static_picture(path, sizes="100vw", **attrs):
+    """
+    Like {% picture %} for a file under STATICFILES_DIRS, using the
+    derivatives collectstatic built (see greenshan.staticstorage).
+    Without them it degrades to a plain <img>.
+
+        {% static_picture "assets/img/logo.png" sizes="40px" alt="GreenShan Logo" %}
+    """
+    manifest = getattr(staticfiles_storage, "image_variants", {}).get(path, {})
+    image = ResponsiveImage(StaticSource(staticfiles_storage, path), manifest)
+    return image.render(sizes=sizes, **attrs)
@@ -0,0 +1,209 @@
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+# =================================================
+# CONTACT FORM THROTTLING
+# =================================================
+# Every check runs against the shared cache before ContactView touches
+# the database. Each worker also remembers which clients it has already
+# turned away, so a flood from one address costs a dict lookup per
+# request instead of a cache round trip.
+
+ACCEPTED = "accepted"
+DUPLICATE = "duplicate"
+THROTTLED_IP = "throttled_ip"
+THROTTLED_EMAIL = "throttled_email"
+
+VERDICTS = (ACCEPTED, DUPLICATE, THROTTLED_IP, THROTTLED_EMAIL)
+
+LOCAL_MAX_ENTRIES = 10000   # per-worker memory bound
+
+_lock = threading.Lock()
+_blocked = {}   # limiter key -> monotonic time the block ends
+_recent = {}    # message digest -> monotonic time it stops being a duplicate
+
+
+def _cache():
+    return caches[getattr(settings, "CONTACT_THROTTLE_CACHE", "default")]
+
+
+def _digest(*parts):
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()[:32]
+
+
+def _remember(table, key, until):
+    with _lock:
+        if len(table) >= LOCAL_MAX_ENTRIES:
+            now = time.monotonic()
+            for stale in [k for k, expires in table.items() if expires <= now]:
+                del table[stale]
+            if len(table) >= LOCAL_MAX_ENTRIES:
+                table.clear()
+        table[key] = until
+
+
+def _active(table, key):
+    until = table.get(key)
+    return until is not None and until > time.monotonic()
+
+
+def reset_local():
+    """
+    Forget this worker's fast-path state (tests).
+    """
+    with _lock:
+        _blocked.clear()
+        _recent.clear()
+
+
+# ---------------------------------------------
+# Sliding window
+# ---------------------------------------------
+
+class SlidingWindow:
+    """
+    At most ``limit`` hits per ``period`` seconds for each identity.
+    Approximates a true sliding window with two fixed-window counters
+    in the cache, weighting the previous one by how much of it still
+    overlaps: one incr and one get per hit, whatever the limit.
+    """
+
+    def __init__(self, scope, limit, period):
+        self.scope = scope
+        self.limit = limit
+        self.period = period
+
+    def key(self, ident, window):
+        return f"greenshan:throttle:{self.scope}:{_digest(ident)}:{window}"
+
+    def hit(self, ident, now=None):
+        """
+        Count a hit; returns 0 if allowed, else seconds until retrying
+        is worthwhile.
+        """
+        base = f"{self.scope}:{ident}"
+        if _active(_blocked, base):
+            return max(1, math.ceil(_blocked.get(base, 0) - time.monotonic()))
+
+        now = time.time() if now is None else now
+        window, elapsed = divmod(now, self.period)
+        cache = _cache()
+        current = self.key(ident, int(window))
+        cache.add(current, 0, self.period * 2)
+        try:
+            count = cache.incr(current)
+        except ValueError:
+            # Evicted between add() and incr().
+            cache.set(current, 1, self.period * 2)
+            count = 1
+        previous = cache.get(self.key(ident, int(window) - 1), 0)
+
+        overlap = (self.period - elapsed) / self.period
+        if previous * overlap + count <= self.limit:
+            return 0
+
+        retry_after = max(1, math.ceil(self.period - elapsed))
+        _remember(_blocked, base, time.monotonic() + retry_after)
+        return retry_after
+
+
+def limiters():
+    ip_limit, ip_period = getattr(settings, "CONTACT_RATE_IP", (5, 600))
+    email_limit, email_period = getattr(settings, "CONTACT_RATE_EMAIL", (3, 3600))
+    return (
+        (THROTTLED_IP, SlidingWindow("ip", ip_limit, ip_period)),
+        (THROTTLED_EMAIL, SlidingWindow("email", email_limit, email_period)),
+    )
+
+
+# ---------------------------------------------
+# Contact checks
+# ---------------------------------------------
+
+def client_ip(request):
+    """
+    REMOTE_ADDR, or the address THROTTLE_PROXY_COUNT trusted proxies
+    (nginx, a load balancer) appended to X-Forwarded-For.
+    """
+    hops = getattr(settings, "THROTTLE_PROXY_COUNT", 0)
+    forwarded = [ip.strip() for ip in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",") if ip.strip()]
+    if hops and len(forwarded) >= hops:
+        return forwarded[-hops]
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def message_digest(fields):
+    message = " ".join(fields["message"].lower().split())
+    return _digest(fields["email"].lower(), message)
+
+
+def _message_key(digest):
+    return f"greenshan:throttle:message:{digest}"
+
+
+def check_contact(request, fields):
+    """
+    (verdict, retry_after) for a well-formed contact submission; only
+    ACCEPTED should be written, followed by remember_contact() once the
+    write succeeded.
+    """
+    if not getattr(settings, "CONTACT_THROTTLE_ENABLED", True):
+        return ACCEPTED, 0
+
+    digest = message_digest(fields)
+    if _active(_recent, digest) or _cache().get(_message_key(digest)):
+        return record(DUPLICATE), 0
+
+    identities = {THROTTLED_IP: client_ip(request), THROTTLED_EMAIL: fields["email"].lower()}
+    for verdict, limiter in limiters():
+        retry_after = limiter.hit(identities[verdict])
+        if retry_after:
+            return record(verdict), retry_after
+
+    return record(ACCEPTED), 0
+
+
+def remember_contact(fields):
+    """
+    Make an identical resubmission (double click, replaying bot) a
+    DUPLICATE. Only called after the message is stored: if the write
+    fails, the visitor's retry must be accepted, not acknowledged.
+    """
+    if not getattr(settings, "CONTACT_THROTTLE_ENABLED", True):
+        return
+
+    window = getattr(settings, "CONTACT_DUPLICATE_WINDOW", 60 * 60 * 24)
+    digest = message_digest(fields)
+    _cache().set(_message_key(digest), 1, window)
+    _remember(_recent, digest, time.monotonic() + window)
+
+
+# ---------------------------------------------
+# Monitoring counters
+# ---------------------------------------------
+
+def _stat_key(verdict):
+    return f"greenshan:throttle:stats:{verdict}"
+
+
+def record(verdict):
+    cache = _cache()
+    cache.add(_stat_key(verdict), 0, None)
+    try:
+        cache.incr(_stat_key(verdict))
+    except ValueError:
+        cache.set(_stat_key(verdict), 1, None)
+    return verdict
+
+
+def stats():
+    """
+    Totals since the cache was last cleared, across all workers.
+    """
+    found = _cache().get_many([_stat_key(verdict) for verdict in VERDICTS])
+    return {verdict: found.get(_stat_key(verdict), 0) for verdict in VERDICTS}
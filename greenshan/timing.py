@@ -0,0 +1,268 @@
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.template.backends import django as django_backend
+
+logger = logging.getLogger("greenshan.timing")
+
+# =================================================
+# REQUEST TIMING
+# =================================================
+# ServerTimingMiddleware puts a RequestTimings in a context variable for
+# the duration of each request. The hooks below (a database execute
+# wrapper, the template backend, the media storage) add to whichever
+# one is current, so async views and their sync_to_async threads are
+# covered too. Outside a request, or with SERVER_TIMING_ENABLED off (the
+# middleware then unloads itself), a hook is one ContextVar lookup.
+
+_current = ContextVar("greenshan_request_timings", default=None)
+
+SQL_DESC_LENGTH = 60     # slowest query in the header (staff only)
+SQL_LOG_LENGTH = 500
+
+
+def enabled():
+    return getattr(settings, "SERVER_TIMING_ENABLED", False)
+
+
+def _elapsed_ms(start):
+    return (time.perf_counter() - start) * 1000
+
+
+class RequestTimings:
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total = 0.0
+        self.queries = 0
+        self.sql = 0.0
+        self.slowest = (0.0, "")
+        self.slow_queries = []
+        self.template = 0.0
+        self.storage_calls = 0
+        self.storage = 0.0
+        # Only the outermost render / storage call is timed: nested ones
+        # (an include, save() calling exists()) are part of it.
+        self.depth = {"template": 0, "storage": 0}
+
+    def add_query(self, sql, ms):
+        self.queries += 1
+        self.sql += ms
+        if ms > self.slowest[0]:
+            self.slowest = (ms, sql)
+        if ms >= getattr(settings, "SERVER_TIMING_SLOW_QUERY_MS", 100):
+            self.slow_queries.append((ms, sql))
+
+    def stop(self):
+        self.total = _elapsed_ms(self.started)
+
+    def header(self):
+        slowest_ms, slowest_sql = self.slowest
+        metrics = [
+            _metric("db", self.sql, f"{self.queries} queries"),
+            _metric("db-slowest", slowest_ms, _one_line(slowest_sql)[:SQL_DESC_LENGTH]),
+            _metric("tpl", self.template),
+            _metric("storage", self.storage, f"{self.storage_calls} calls"),
+            _metric("total", self.total),
+        ]
+        return ", ".join(metrics)
+
+    def as_dict(self):
+        slowest_ms, slowest_sql = self.slowest
+        return {
+            "total_ms": round(self.total, 2),
+            "db_queries": self.queries,
+            "db_ms": round(self.sql, 2),
+            "slowest_query_ms": round(slowest_ms, 2),
+            "slowest_query": _one_line(slowest_sql)[:SQL_LOG_LENGTH],
+            "slow_queries": [
+                {"ms": round(ms, 2), "sql": _one_line(sql)[:SQL_LOG_LENGTH]}
+                for ms, sql in self.slow_queries
+            ],
+            "template_ms": round(self.template, 2),
+            "storage_calls": self.storage_calls,
+            "storage_ms": round(self.storage, 2),
+        }
+
+
+def _one_line(text):
+    return " ".join(text.split())
+
+
+def _metric(name, ms, desc=""):
+    value = f"{name};dur={ms:.1f}"
+    if desc:
+        # Header values must be latin-1; quoted-string escaping.
+        desc = desc.encode("ascii", "replace").decode().replace("\\", "\\\\").replace('"', '\\"')
+        value += f';desc="{desc}"'
+    return value
+
+
+@contextmanager
+def collect():
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+        timings.stop()
+
+
+def _timed(kind, func, *args, **kwargs):
+    timings = _current.get()
+    if timings is None or timings.depth[kind]:
+        return func(*args, **kwargs)
+
+    timings.depth[kind] += 1
+    start = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        timings.depth[kind] -= 1
+        if kind == "template":
+            timings.template += _elapsed_ms(start)
+        else:
+            timings.storage_calls += 1
+            timings.storage += _elapsed_ms(start)
+
+
+# ---------------------------------------------
+# SQL (every connection, every thread)
+# ---------------------------------------------
+
+def time_query(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.add_query(sql, _elapsed_ms(start))
+
+
+def install_query_timer(sender, connection, **kwargs):
+    """
+    connection_created receiver. Wrappers live on the connection object,
+    which outlives reconnects: add ours once.
+    """
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
+
+
+# ---------------------------------------------
+# Templates
+# ---------------------------------------------
+
+class Template(django_backend.Template):
+
+    def render(self, context=None, request=None):
+        return _timed("template", super().render, context, request)
+
+
+class DjangoTemplates(django_backend.DjangoTemplates):
+    """
+    The stock Django backend, with top-level renders timed.
+    """
+
+    def from_string(self, template_code):
+        return Template(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        return Template(super().get_template(template_name).template, self)
+
+
+# ---------------------------------------------
+# Storage
+# ---------------------------------------------
+
+class TimedStorageMixin:
+    """
+    Counts and times the storage calls that touch the backend. open()
+    covers opening only; reads of the returned file are not included.
+    """
+
+    def open(self, name, mode="rb"):
+        return _timed("storage", super().open, name, mode)
+
+    def save(self, name, content, max_length=None):
+        return _timed("storage", super().save, name, content, max_length=max_length)
+
+    def delete(self, name):
+        return _timed("storage", super().delete, name)
+
+    def exists(self, name):
+        return _timed("storage", super().exists, name)
+
+    def listdir(self, path):
+        return _timed("storage", super().listdir, path)
+
+    def size(self, name):
+        return _timed("storage", super().size, name)
+
+    def get_modified_time(self, name):
+        return _timed("storage", super().get_modified_time, name)
+
+
+# =================================================
+# MIDDLEWARE
+# =================================================
+
+class ServerTimingMiddleware:
+    """
+    Server-Timing header for staff, one JSON log line per request on
+    the "greenshan.timing" logger (WARNING past the slow thresholds).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        with collect() as timings:
+            response = self.get_response(request)
+        user = getattr(request, "user", None)
+        return self.finish(request, response, timings, user)
+
+    async def __acall__(self, request):
+        with collect() as timings:
+            response = await self.get_response(request)
+        # request.user is lazy; never evaluate it on the event loop.
+        user = await request.auser() if hasattr(request, "auser") else None
+        return self.finish(request, response, timings, user)
+
+    def finish(self, request, response, timings, user):
+        if user is not None and user.is_staff:
+            response["Server-Timing"] = timings.header()
+
+        slow = (
+            timings.slow_queries
+            or timings.total >= getattr(settings, "SERVER_TIMING_SLOW_REQUEST_MS", 1000)
+        )
+        level = logging.WARNING if slow else logging.INFO
+        if logger.isEnabledFor(level):
+            match = request.resolver_match
+            logger.log(level, json.dumps({
+                "method": request.method,
+                "path": request.path,
+                "url_name": match.view_name if match else None,
+                "status": response.status_code,
+                **timings.as_dict(),
+            }))
+        return response
@@ -0,0 +1,279 @@
+import fcntl
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from .hashing import BlockHasher, HASH_BLOCK_SIZE, combine
+from .jobs import enqueue
+from .models import (
+    ProjectMedia,
+    UploadSession,
+    MAX_MEDIA_PER_PROJECT,
+    validate_file_content,
+    validate_file_extension,
+    validate_upload_size,
+)
+
+# =================================================
+# CHUNKED, RESUMABLE UPLOADS
+# =================================================
+# 1. start()       declare name/type/size; rejected up front if too big
+# 2. write_chunk() append bytes at the session's current offset
+# 3. finish()      move the assembled file into storage as ProjectMedia
+#
+# Each chunk is a short request, so no worker is tied up for a whole
+# 100 MB transfer, and a dropped connection only loses one chunk.
+# Non-final chunks must end on a hash block boundary so the hasher
+# state can be persisted between requests (see hashing.py).
+
+UPLOAD_CHUNK_SIZE = HASH_BLOCK_SIZE
+READ_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    status = 400
+
+
+class OffsetMismatch(UploadError):
+    status = 409
+
+
+class LengthRequired(UploadError):
+    status = 411
+
+
+class UploadTooLarge(UploadError):
+    status = 413
+
+
+class UnsupportedContent(UploadError):
+    status = 415
+
+
+def temp_dir():
+    return getattr(settings, "CHUNKED_UPLOAD_DIR", os.path.join(settings.BASE_DIR, ".uploads"))
+
+
+def temp_path(session):
+    return os.path.join(temp_dir(), f"{session.pk.hex}.part")
+
+
+def _validate(filename, media_type, size):
+    try:
+        validate_upload_size(size)
+    except ValidationError as exc:
+        raise UploadTooLarge(exc.messages[0])
+    try:
+        validate_file_extension(File(None, name=filename), media_type)
+    except ValidationError as exc:
+        raise UploadError(exc.messages[0])
+
+
+def _check_media_limit(count):
+    if count >= MAX_MEDIA_PER_PROJECT:
+        raise UploadError(
+            f"A project can have a maximum of {MAX_MEDIA_PER_PROJECT} media files."
+        )
+
+
+def start(project, filename, media_type, size, caption="", user=None):
+    filename = os.path.basename(filename or "").strip()
+    if not filename or size < 1:
+        raise UploadError("A file name and a positive size are required.")
+    if media_type not in dict(ProjectMedia.MEDIA_CHOICES):
+        raise UploadError("Unknown media type.")
+    _validate(filename, media_type, size)
+    _check_media_limit(project.media.count())
+
+    os.makedirs(temp_dir(), exist_ok=True)
+    session = UploadSession.objects.create(
+        project=project,
+        uploaded_by=user if user and user.is_authenticated else None,
+        filename=filename,
+        media_type=media_type,
+        caption=caption[:250],
+        size=size,
+    )
+    open(temp_path(session), "wb").close()
+    return session
+
+
+def write_chunk(session, offset, stream, length):
+    """
+    Stream ``length`` bytes from ``stream`` into the session's temp file
+    at ``offset``, hashing as they pass. Returns the new offset.
+
+    The size limit is enforced on bytes actually read, so a client that
+    lies about its size is cut off mid-chunk, not after the fact.
+
+    The temp file is flock()ed until the offset is committed: a second
+    request for the same session is refused instead of truncating or
+    interleaving with the bytes being written.
+    """
+    if length is None:
+        raise LengthRequired("Chunks need a Content-Length.")
+    if offset != session.received:
+        raise OffsetMismatch(f"Expected offset {session.received}.")
+
+    end = offset + length
+    if length < 1 or end > session.size:
+        raise UploadTooLarge("Chunk runs past the declared file size.")
+    if end != session.size and end % HASH_BLOCK_SIZE:
+        raise UploadError(f"Chunks must be a multiple of {HASH_BLOCK_SIZE} bytes.")
+
+    with open(temp_path(session), "r+b") as fh:
+        try:
+            fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise OffsetMismatch("Another request is writing this upload.")
+        try:
+            return _write_locked(session, fh, offset, end, stream, length)
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _write_locked(session, fh, offset, end, stream, length):
+    # A request that held the lock before us may have moved the offset.
+    session.refresh_from_db(fields=["received", "block_digests"])
+    if offset != session.received:
+        raise OffsetMismatch(f"Expected offset {session.received}.")
+
+    hasher = BlockHasher(session.block_digests)
+    written = 0
+
+    # Drop whatever a previously interrupted chunk left behind.
+    fh.truncate(offset)
+    fh.seek(offset)
+    while written < length:
+        data = stream.read(min(READ_SIZE, length - written))
+        if not data:
+            break
+        fh.write(data)
+        hasher.update(data)
+        written += len(data)
+
+    if written != length:
+        fh.truncate(offset)
+        raise UploadError("Chunk ended early; resume from the last offset.")
+
+    if offset == 0:
+        # Sniff the first chunk before accepting any more bytes.
+        fh.seek(0)
+        try:
+            validate_file_content(File(fh, name=session.filename), session.media_type)
+        except ValidationError as exc:
+            fh.truncate(0)
+            raise UnsupportedContent(exc.messages[0])
+    fh.flush()
+
+    digests = hasher.final_digests() if end == session.size else hasher.state
+
+    # Conditional: a concurrent request for the same offset loses.
+    claimed = UploadSession.objects.filter(pk=session.pk, received=offset).update(
+        received=end,
+        block_digests=digests,
+        updated=timezone.now(),
+    )
+    if not claimed:
+        raise OffsetMismatch("Another request wrote this chunk.")
+
+    session.received = end
+    session.block_digests = digests
+    return end
+
+
+class AssembledFile(File):
+    """
+    The finished temp file. ``temporary_file_path`` lets
+    FileSystemStorage rename it into MEDIA_ROOT instead of copying;
+    other storages stream it with chunks().
+    """
+
+    def __init__(self, path, name):
+        super().__init__(open(path, "rb"), name=name)
+        self.path = path
+
+    def temporary_file_path(self):
+        return self.path
+
+
+def digest(session):
+    """
+    Content digest of a complete upload (same as hashing.hash_stream).
+    """
+    return combine(session.block_digests)
+
+
+def finish(session):
+    """
+    Attach the assembled upload to a new ProjectMedia row.
+    """
+    if not session.complete:
+        raise UploadError("Upload is not complete.")
+
+    # Other uploads may have finished since start() checked.
+    order = session.project.media.count()
+    try:
+        _check_media_limit(order)
+    except UploadError:
+        discard(session)
+        session.delete()
+        raise
+
+    media = ProjectMedia(
+        project=session.project,
+        media_type=session.media_type,
+        caption=session.caption,
+        order=order,
+    )
+
+    path = temp_path(session)
+    assembled = AssembledFile(path, session.filename)
+    # Hashed chunk by chunk on the way in; the storage reuses it.
+    assembled.content_digest = digest(session)
+    try:
+        media.file.save(session.filename, assembled, save=False)
+    finally:
+        assembled.close()
+
+    try:
+        with transaction.atomic():
+            media.save()
+            session.delete()
+    except Exception:
+        # Content-addressed: other rows may share the name.
+        enqueue("files.delete", paths=[media.file.name])
+        raise
+
+    # Already renamed away on FileSystemStorage; copied elsewhere.
+    _remove(path)
+    return media
+
+
+def discard(session):
+    _remove(temp_path(session))
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def purge_expired(max_age=None):
+    """
+    Forget sessions nobody has touched within UPLOAD_SESSION_TTL.
+    """
+    max_age = max_age or getattr(settings, "UPLOAD_SESSION_TTL", 60 * 60 * 24)
+    cutoff = timezone.now() - timedelta(seconds=max_age)
+    expired = list(UploadSession.objects.filter(updated__lt=cutoff))
+    for session in expired:
+        discard(session)
+    UploadSession.objects.filter(pk__in=[session.pk for session in expired]).delete()
+    return len(expired)
@@ -1,22 +1,29 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
 
 app_name = "greenshan"
 
+# Public pages run natively async under ASGI (see greenshan_project/asgi.py);
+# under WSGI the sync views avoid an event loop per request.
+public = async_views if settings.ASYNC_VIEWS else views
+
 urlpatterns = [
 
     # =========================
     # PUBLIC PAGES
     # =========================
-    path("", views.home, name="home"),
-    path("about/", views.about, name="about"),
-    path("services/", views.services_view, name="services"),
-    path("portfolio/", views.portfolio, name="portfolio"),
-    path("contact/", views.contact, name="contact"),
+    path("", public.home, name="home"),
+    path("about/", public.about, name="about"),
+    path("services/", public.services_view, name="services"),
+    path("portfolio/", public.portfolio, name="portfolio"),
+    path("portfolio/more/", public.portfolio_more, name="portfolio_more"),
+    path("search/", views.search_view, name="search"),
+    path("contact/", public.contact, name="contact"),
 
     path(
         "project/<slug:slug>/",
-        views.ProjectDetailView.as_view(),
+        async_views.project_detail if settings.ASYNC_VIEWS else views.ProjectDetailView.as_view(),
         name="project_detail",
     ),
 
@@ -52,6 +59,16 @@ urlpatterns = [
         views.delete_project,
         name="manage_delete",
     ),
+    path(
+        "manage/projects/<int:pk>/uploads/",
+        views.start_upload,
+        name="upload_start",
+    ),
+    path(
+        "manage/uploads/<uuid:upload_id>/",
+        views.UploadChunkView.as_view(),
+        name="upload_chunk",
+    ),
 
     # =========================
     # TESTIMONIALS
@@ -80,6 +97,11 @@ urlpatterns = [
         views.ManageContactListView.as_view(),
         name="manage_messages",
     ),
+    path(
+        "manage/messages/bulk/",
+        views.bulk_contact_action,
+        name="messages_bulk",
+    ),
     path(
         "manage/messages/<int:pk>/",
         views.ManageContactDetailView.as_view(),
@@ -95,4 +117,9 @@ urlpatterns = [
         views.delete_contact_message,
         name="message_delete",
     ),
+    path(
+        "manage/messages/throttle-stats/",
+        views.contact_throttle_stats,
+        name="contact_throttle_stats",
+    ),
 ]
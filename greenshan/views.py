@@ -1,11 +1,19 @@
+import os
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.views import View
 from django.views.generic import ListView, DetailView
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.utils.decorators import method_decorator
 from django.contrib import messages
 from django.db import transaction
-from django.views.decorators.http import require_POST
+from django.db.models import Prefetch
+from django.views.decorators.http import require_POST, require_safe
+from django.utils._os import safe_join
 
 from .models import (
     Project,
@@ -13,12 +21,32 @@ from .models import (
     Service,
     Testimonial,
     ContactRequest,
+    UploadSession,
 )
+from . import spool, throttling, uploads
 from .forms import (
     ProjectForm,
     ProjectMediaFormSet,
     TestimonialForm,
 )
+from .caching import (
+    cache_public_page,
+    conditional_public_page,
+    PROJECTS,
+    SERVICES,
+)
+from .pagination import KeysetPaginator
+from .routers import replica_reads
+from .search import search_projects
+from .stats import dashboard_stats, adjust as adjust_counter
+from .storage import is_content_addressed
+from .streaming import serve_file
+
+HOME_FEATURED_LIMIT = 6
+PORTFOLIO_PAGE_SIZE = 12
+PORTFOLIO_KEYS = ("project_date", "created", "id")
+SEARCH_RESULTS_LIMIT = 48
+SEARCH_QUERY_MAX_LENGTH = 100
 
 # =========================================================
 # ACCESS CONTROL HELPERS
@@ -36,18 +64,24 @@ def staff_required(view_func):
 # PUBLIC VIEWS
 # =========================================================
 
+@replica_reads
+@conditional_public_page(PROJECTS)
+@cache_public_page(PROJECTS)
 def home(request):
-    featured_projects = Project.objects.all()   # ✅ clean
+    featured_projects = Project.objects.filter(featured=True)[:HOME_FEATURED_LIMIT]
 
     return render(request, "index.html", {
         "featured_projects": featured_projects
     })
 
 
+@cache_public_page()
 def about(request):
     return render(request, "greenshan/about.html")
 
 
+@replica_reads
+@cache_public_page(SERVICES)
 def services_view(request):
     services = Service.objects.order_by("order")
     return render(
@@ -57,26 +91,170 @@ def services_view(request):
     )
 
 
+def portfolio_paginator(request):
+    """
+    Keyset paginator over portfolio cards, optionally filtered by category.
+    """
+    category = request.GET.get("category", "")
+    if category not in dict(Project.CATEGORY_CHOICES):
+        category = ""
+
+    projects = Project.objects.defer("description", "experience_notes")
+    if category:
+        projects = projects.filter(category=category)
+
+    return KeysetPaginator(projects, PORTFOLIO_KEYS, PORTFOLIO_PAGE_SIZE), category
+
+
+def portfolio_context(request, page, category):
+    next_query = None
+    if page.has_next:
+        query = request.GET.copy()
+        query["cursor"] = page.next_cursor
+        next_query = query.urlencode()
+
+    return {
+        "projects": page.items,
+        "next_query": next_query,
+        "category": category,
+        "categories": Project.CATEGORY_CHOICES,
+    }
+
+
+def _portfolio_page(request):
+    paginator, category = portfolio_paginator(request)
+    return portfolio_context(request, paginator.page(request.GET.get("cursor")), category)
+
+
+@replica_reads
+@conditional_public_page(PROJECTS)
+@cache_public_page(PROJECTS)
 def portfolio(request):
-    projects = Project.objects.all()
     return render(
         request,
         "greenshan/portfolio.html",
-        {"projects": projects},
+        _portfolio_page(request),
     )
 
 
+@replica_reads
+@conditional_public_page(PROJECTS)
+@cache_public_page(PROJECTS)
+def portfolio_more(request):
+    """
+    HTML fragment with the next page of cards for infinite scroll.
+    The following page's URL travels in the X-Next-Page header.
+    """
+    context = _portfolio_page(request)
+    return with_next_page(
+        render(request, "greenshan/partials/project_cards.html", context),
+        context,
+    )
+
+
+def with_next_page(response, context):
+    if context["next_query"]:
+        response["X-Next-Page"] = f"{reverse('greenshan:portfolio_more')}?{context['next_query']}"
+    return response
+
+
+@require_safe
+def search_view(request):
+    """
+    Ranked project search over the full-text index. Not page-cached:
+    arbitrary queries would only churn the cache.
+    """
+    query = request.GET.get("q", "").strip()[:SEARCH_QUERY_MAX_LENGTH]
+    projects = []
+    if query:
+        projects = search_projects(
+            query,
+            limit=SEARCH_RESULTS_LIMIT,
+            queryset=Project.objects.defer("description", "experience_notes"),
+        )
+
+    return render(
+        request,
+        "greenshan/search.html",
+        {"query": query, "projects": projects},
+    )
+
+
+@method_decorator(replica_reads, name="dispatch")
+@method_decorator(conditional_public_page(PROJECTS), name="dispatch")
+@method_decorator(cache_public_page(PROJECTS), name="dispatch")
 class ProjectDetailView(DetailView):
     model = Project
     template_name = "greenshan/detail.html"
     slug_field = "slug"
     context_object_name = "project"
 
+    def get_queryset(self):
+        # Project + ordered media in two queries, however many media exist.
+        return Project.objects.prefetch_related(
+            Prefetch(
+                "media",
+                queryset=ProjectMedia.objects.order_by("order", "created"),
+            )
+        )
+
+
+# =========================================================
+# UPLOADED MEDIA (PUBLIC)
+# =========================================================
+
+@require_safe
+def serve_media(request, path):
+    """
+    Seekable delivery of MEDIA_ROOT files (Range/206, If-Range,
+    conditional GET). Bytes go out via sendfile or the front-end server.
+    """
+    # Hidden names (e.g. a pre-CAS_WORK_DIR cas/.tmp) are never media.
+    if any(part.startswith(".") for part in path.split("/")):
+        raise Http404("Media file not found.")
+
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("Media file not found.")
+
+    if not os.path.isfile(full_path):
+        raise Http404("Media file not found.")
+
+    return serve_file(request, full_path, immutable=is_content_addressed(path))
+
 
 # =========================================================
 # CONTACT (PUBLIC)
 # =========================================================
 
+def contact_submission(request):
+    """
+    (ContactRequest fields, None) or (None, error message).
+    """
+    fields = {
+        "name": request.POST.get("name", "").strip(),
+        "email": request.POST.get("email", "").strip(),
+        "subject": request.POST.get("subject", "").strip(),
+        "message": request.POST.get("message", "").strip(),
+    }
+
+    if not fields["name"] or not fields["email"] or not fields["message"]:
+        return None, "All required fields must be filled."
+
+    if len(fields["message"]) > 2000:
+        return None, "Message is too long."
+
+    return fields, None
+
+
+def contact_throttled(request, template_name, retry_after):
+    messages.error(request, "Too many messages from you. Please try again later.")
+    response = render(request, template_name, status=429)
+    response["Retry-After"] = str(retry_after)
+    return response
+
+
 class ContactView(View):
     template_name = "greenshan/contact.html"
 
@@ -84,25 +262,22 @@ class ContactView(View):
         return render(request, self.template_name)
 
     def post(self, request):
-        name = request.POST.get("name", "").strip()
-        email = request.POST.get("email", "").strip()
-        subject = request.POST.get("subject", "").strip()
-        message_text = request.POST.get("message", "").strip()
-
-        if not name or not email or not message_text:
-            messages.error(request, "All required fields must be filled.")
+        fields, error = contact_submission(request)
+        if error:
+            messages.error(request, error)
             return redirect("greenshan:contact")
 
-        if len(message_text) > 2000:
-            messages.error(request, "Message is too long.")
-            return redirect("greenshan:contact")
+        verdict, retry_after = throttling.check_contact(request, fields)
+        if retry_after:
+            return contact_throttled(request, self.template_name, retry_after)
 
-        ContactRequest.objects.create(
-            name=name,
-            email=email,
-            subject=subject,
-            message=message_text,
-        )
+        # A duplicate was already stored: confirm it again, write nothing.
+        if verdict == throttling.ACCEPTED:
+            if spool.enabled():
+                spool.append(fields)
+            else:
+                ContactRequest.objects.create(**fields)
+            throttling.remember_contact(fields)
 
         messages.success(request, "Message sent successfully.")
         return redirect("greenshan:contact")
@@ -116,24 +291,12 @@ contact = ContactView.as_view()
 
 @staff_required
 def manage_dashboard(request):
+    # projects_total, featured_projects, media_count, testimonials_total,
+    # testimonials_visible, messages_pending — one query (see stats.py)
     return render(
         request,
         "manage/dashboard.html",
-        {
-            # Projects
-            "projects_total": Project.objects.count(),
-            "featured_projects": Project.objects.filter(featured=True).count(),
-
-            # Media
-            "media_count": ProjectMedia.objects.count(),
-
-            # Testimonials
-            "testimonials_total": Testimonial.objects.count(),
-            "testimonials_visible": Testimonial.objects.filter(visible=True).count(),
-
-            # Messages (pending only)
-            "messages_pending": ContactRequest.objects.filter(handled=False).count(),
-        },
+        dashboard_stats(),
     )
 
 
@@ -232,6 +395,98 @@ class ManageProjectUpdateView(View):
         )
 
 
+# =========================================================
+# CHUNKED MEDIA UPLOADS (STAFF ONLY)
+# =========================================================
+
+def _upload_state(session):
+    return {
+        "id": str(session.pk),
+        "url": reverse("greenshan:upload_chunk", args=[session.pk]),
+        "offset": session.received,
+        "size": session.size,
+        "chunk_size": uploads.UPLOAD_CHUNK_SIZE,
+        "complete": session.complete,
+    }
+
+
+def _upload_error(exc):
+    return JsonResponse({"error": str(exc)}, status=exc.status)
+
+
+@staff_required
+@require_POST
+def start_upload(request, pk):
+    project = get_object_or_404(Project, pk=pk)
+    try:
+        size = int(request.POST.get("size", ""))
+    except ValueError:
+        return JsonResponse({"error": "A numeric size is required."}, status=400)
+
+    try:
+        session = uploads.start(
+            project,
+            request.POST.get("filename", ""),
+            request.POST.get("media_type", ""),
+            size,
+            caption=request.POST.get("caption", ""),
+            user=request.user,
+        )
+    except uploads.UploadError as exc:
+        return _upload_error(exc)
+
+    return JsonResponse(_upload_state(session), status=201)
+
+
+@method_decorator(staff_required, name="dispatch")
+class UploadChunkView(View):
+    """
+    GET reports the offset to resume from; POST appends the raw request
+    body at ``Upload-Offset``; DELETE abandons the upload. The chunk is
+    streamed from the socket to disk, never buffered whole.
+    """
+
+    def get(self, request, upload_id):
+        session = get_object_or_404(UploadSession, pk=upload_id)
+        response = JsonResponse(_upload_state(session))
+        response["Upload-Offset"] = session.received
+        return response
+
+    def post(self, request, upload_id):
+        session = get_object_or_404(UploadSession, pk=upload_id)
+        try:
+            offset = int(request.headers.get("Upload-Offset", ""))
+        except ValueError:
+            return JsonResponse({"error": "Upload-Offset header is required."}, status=400)
+        try:
+            length = int(request.META["CONTENT_LENGTH"])
+        except (KeyError, ValueError):
+            # Absent or blank: chunks must declare their size up front.
+            length = None
+
+        try:
+            uploads.write_chunk(session, offset, request, length)
+            if not session.complete:
+                return JsonResponse(_upload_state(session))
+
+            state = _upload_state(session)
+            state["digest"] = uploads.digest(session)
+            media = uploads.finish(session)
+        except uploads.UploadError as exc:
+            response = _upload_error(exc)
+            response["Upload-Offset"] = session.received
+            return response
+
+        state["media_id"] = media.pk
+        return JsonResponse(state, status=201)
+
+    def delete(self, request, upload_id):
+        session = get_object_or_404(UploadSession, pk=upload_id)
+        uploads.discard(session)
+        session.delete()
+        return HttpResponse(status=204)
+
+
 @staff_required
 @require_POST
 def delete_project(request, pk):
@@ -288,11 +543,90 @@ def delete_testimonial(request, pk):
 # CONTACT MESSAGES (STAFF ONLY)
 # =========================================================
 
+INBOX_PAGE_SIZE = 50
+INBOX_KEYS = ("created", "id")
+INBOX_FILTERS = {
+    "pending": {"handled": False},
+    "handled": {"handled": True},
+}
+
+
+def _inbox_queryset(status):
+    return ContactRequest.objects.filter(**INBOX_FILTERS.get(status, {}))
+
+
 @method_decorator(staff_required, name="dispatch")
-class ManageContactListView(ListView):
-    model = ContactRequest
+class ManageContactListView(View):
     template_name = "manage/messages.html"
-    context_object_name = "contact_messages"
+
+    def get(self, request):
+        status = request.GET.get("status", "")
+        if status not in INBOX_FILTERS:
+            status = ""
+
+        paginator = KeysetPaginator(
+            _inbox_queryset(status).defer("message"),
+            INBOX_KEYS,
+            INBOX_PAGE_SIZE,
+        )
+        page = paginator.page(request.GET.get("cursor"))
+
+        next_query = None
+        if page.has_next:
+            query = request.GET.copy()
+            query["cursor"] = page.next_cursor
+            next_query = query.urlencode()
+
+        return render(
+            request,
+            self.template_name,
+            {
+                "contact_messages": page.items,
+                "next_query": next_query,
+                "status": status,
+                "is_first_page": not request.GET.get("cursor"),
+            },
+        )
+
+
+@staff_required
+@require_POST
+def bulk_contact_action(request):
+    """
+    Mark handled / delete the selected messages, or every message in
+    the current filter, as one UPDATE or DELETE statement. Neither
+    sends signals, so the pending counter is adjusted once here.
+    """
+    action = request.POST.get("action")
+    status = request.POST.get("status", "")
+
+    if status and status not in INBOX_FILTERS:
+        # An unknown filter must not widen "all" to every message.
+        messages.error(request, "Unknown message filter.")
+        return redirect("greenshan:manage_messages")
+
+    if request.POST.get("scope") == "all":
+        queryset = _inbox_queryset(status)
+    else:
+        ids = [pk for pk in request.POST.getlist("ids") if pk.isdigit()]
+        queryset = ContactRequest.objects.filter(pk__in=ids)
+
+    with transaction.atomic():
+        if action == "handled":
+            count = queryset.filter(handled=False).update(handled=True)
+            adjust_counter("messages_pending", -count)
+            messages.success(request, f"{count} message(s) marked as handled.")
+
+        elif action == "delete":
+            pending = queryset.filter(handled=False).count()
+            count = queryset.bulk_delete()
+            adjust_counter("messages_pending", -pending)
+            messages.success(request, f"{count} message(s) deleted.")
+
+    redirect_to = reverse("greenshan:manage_messages")
+    if status:
+        redirect_to += f"?status={status}"
+    return redirect(redirect_to)
 
 
 @method_decorator(staff_required, name="dispatch")
@@ -311,9 +645,9 @@ class ManageContactDetailView(View):
 @staff_required
 @require_POST
 def mark_contact_handled(request, pk):
-    message = get_object_or_404(ContactRequest, pk=pk)
+    message = get_object_or_404(ContactRequest.objects.only("pk", "handled"), pk=pk)
     message.handled = True
-    message.save()
+    message.save(update_fields=["handled"])
     return redirect("greenshan:manage_messages")
 
 
@@ -323,3 +657,13 @@ def delete_contact_message(request, pk):
     message = get_object_or_404(ContactRequest, pk=pk)
     message.delete()
     return redirect("greenshan:manage_messages")
+
+
+@staff_required
+@require_safe
+def contact_throttle_stats(request):
+    """
+    Contact form verdict totals (accepted, duplicate, throttled_ip,
+    throttled_email) for monitoring.
+    """
+    return JsonResponse(throttling.stats())
@@ -2,6 +2,8 @@
 ASGI config for greenshan_project project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Public pages are served by greenshan.async_views here; see
+deploy/gunicorn_asgi.py for the production profile.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -12,5 +14,10 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'greenshan_project.settings')
+os.environ.setdefault('ASYNC_VIEWS', 'True')
+# Async requests each get a fresh thread for their ORM calls, so a
+# persistent connection would outlive its thread; pool instead
+# (DATABASE_POOL) on PostgreSQL.
+os.environ.setdefault('DATABASE_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
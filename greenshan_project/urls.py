@@ -1,7 +1,8 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
-from django.conf.urls.static import static
+
+from greenshan.views import serve_media
 
 
 urlpatterns = [
@@ -16,9 +17,11 @@ urlpatterns = [
 ]
 
 
-# Serve media files in development only
-if settings.DEBUG:
-    urlpatterns += static(
-        settings.MEDIA_URL,
-        document_root=settings.MEDIA_ROOT,
-    )
+# Uploaded media (Range/206 aware; see MEDIA_SENDFILE in settings)
+urlpatterns += [
+    re_path(
+        r"^%s(?P<path>.+)$" % settings.MEDIA_URL.lstrip("/"),
+        serve_media,
+        name="media",
+    ),
+]
@@ -10,6 +10,8 @@ document.addEventListener("DOMContentLoaded", () => {
   initLightbox();
   initCounters();
   initTextareaAutoresize(); // NEW: Premium form UX
+  initLoadMore();
+  initChunkedUploads();
 });
 
 /* =========================================================
@@ -126,7 +128,7 @@ function initLightbox() {
 
   document.querySelectorAll("img[data-lightbox]").forEach(image => {
     image.addEventListener("click", () => {
-      img.src = image.src;
+      img.src = image.dataset.full || image.currentSrc || image.src;
       lightbox.removeAttribute("hidden");
       document.body.style.overflow = "hidden"; // Prevent scrolling
     });
@@ -196,4 +198,172 @@ function initTextareaAutoresize() {
       this.style.height = (this.scrollHeight) + "px";
     });
   });
-}
\ No newline at end of file
+}
+
+/* =========================================================
+   8. INFINITE SCROLL (HTML FRAGMENTS)
+========================================================= */
+function initLoadMore() {
+  const trigger = document.querySelector("[data-load-more]");
+  if (!trigger) return;
+
+  const target = document.querySelector(trigger.dataset.target);
+  if (!target) return;
+
+  let loading = false;
+  let failed = false;
+
+  const loadNext = async () => {
+    const url = trigger.dataset.loadMore;
+    if (loading || !url) return;
+    loading = true;
+
+    try {
+      const response = await fetch(url, { headers: { "X-Requested-With": "fetch" } });
+      if (!response.ok) throw new Error(response.statusText);
+
+      target.insertAdjacentHTML("beforeend", await response.text());
+
+      const next = response.headers.get("X-Next-Page");
+      if (next) {
+        trigger.dataset.loadMore = next;
+        // Keep the plain link on the same cursor as the fragment URL.
+        const link = new URL(trigger.href, window.location.href);
+        link.search = new URL(next, window.location.href).search;
+        trigger.href = link.toString();
+      } else {
+        observer?.disconnect();
+        trigger.parentElement.remove();
+      }
+    } catch (err) {
+      // Fall back to the plain link (full page navigation)
+      failed = true;
+      observer?.disconnect();
+    } finally {
+      loading = false;
+    }
+  };
+
+  trigger.addEventListener("click", e => {
+    if (failed) return;
+    e.preventDefault();
+    loadNext();
+  });
+
+  const observer = "IntersectionObserver" in window
+    ? new IntersectionObserver(entries => {
+        if (entries.some(entry => entry.isIntersecting)) loadNext();
+      }, { rootMargin: "600px" })
+    : null;
+
+  observer?.observe(trigger);
+}
+
+
+/* =========================================================
+   9. CHUNKED, RESUMABLE MEDIA UPLOADS (MANAGE UI)
+========================================================= */
+function initChunkedUploads() {
+  const panel = document.querySelector("[data-chunked-upload]");
+  if (!panel) return;
+
+  const fileInput = panel.querySelector("[data-upload-file]");
+  const button = panel.querySelector("[data-upload-start]");
+  const progress = panel.querySelector("[data-upload-progress]");
+  const status = panel.querySelector("[data-upload-status]");
+  const csrf = document.querySelector("[name=csrfmiddlewaretoken]")?.value;
+
+  const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+  const report = (offset, size) => {
+    progress.value = Math.floor((offset / size) * 100);
+    status.textContent = `${(offset / 1048576).toFixed(1)} / ${(size / 1048576).toFixed(1)} MB`;
+  };
+
+  // Resume an upload of the same file after a reload or dropped connection
+  const resumeKey = file => `upload:${panel.dataset.chunkedUpload}:${file.name}:${file.size}:${file.lastModified}`;
+
+  const startSession = async file => {
+    const saved = localStorage.getItem(resumeKey(file));
+    if (saved) {
+      const response = await fetch(saved);
+      if (response.ok) return response.json();
+      localStorage.removeItem(resumeKey(file));
+    }
+
+    const body = new FormData();
+    body.append("filename", file.name);
+    body.append("size", file.size);
+    body.append("media_type", panel.querySelector("[data-upload-type]").value);
+    body.append("caption", panel.querySelector("[data-upload-caption]").value);
+
+    const response = await fetch(panel.dataset.chunkedUpload, {
+      method: "POST",
+      headers: { "X-CSRFToken": csrf },
+      body,
+    });
+    const state = await response.json();
+    if (!response.ok) throw new Error(state.error || response.statusText);
+    localStorage.setItem(resumeKey(file), state.url);
+    return state;
+  };
+
+  const upload = async file => {
+    const state = await startSession(file);
+    let offset = state.offset;
+    let failures = 0;
+
+    while (offset < file.size) {
+      report(offset, file.size);
+      const end = Math.min(offset + state.chunk_size, file.size);
+
+      let response;
+      try {
+        response = await fetch(state.url, {
+          method: "POST",
+          headers: {
+            "X-CSRFToken": csrf,
+            "Upload-Offset": offset,
+            "Content-Type": "application/octet-stream",
+          },
+          body: file.slice(offset, end),
+        });
+      } catch (err) {
+        // Network drop: back off, then ask the server where to resume
+        if (++failures > 5) throw err;
+        await sleep(1000 * 2 ** failures);
+        const current = await fetch(state.url).then(r => r.json());
+        offset = current.offset;
+        continue;
+      }
+
+      const result = await response.json();
+      if (response.status === 409) {
+        offset = Number(response.headers.get("Upload-Offset"));
+        continue;
+      }
+      if (!response.ok) throw new Error(result.error || response.statusText);
+
+      failures = 0;
+      offset = result.offset;
+      if (result.media_id) break;
+    }
+
+    localStorage.removeItem(resumeKey(file));
+    report(file.size, file.size);
+  };
+
+  button.addEventListener("click", async () => {
+    const file = fileInput.files[0];
+    if (!file) return;
+
+    button.disabled = true;
+    try {
+      await upload(file);
+      status.textContent = "Upload complete.";
+      window.location.reload();
+    } catch (err) {
+      status.textContent = err.message;
+      button.disabled = false;
+    }
+  });
+}